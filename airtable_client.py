@@ -0,0 +1,176 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import METRICS
+
+# ---------------- LIMITS ----------------
+
+# Airtable accepts at most 10 records per create/update request and
+# 5 requests per second per base; a 429 locks the base out for 30 seconds.
+AIRTABLE_BATCH_SIZE = 10
+AIRTABLE_REQUESTS_PER_SECOND = 5
+AIRTABLE_MAX_ATTEMPTS = 5
+AIRTABLE_BACKOFF_BASE = 1.0
+AIRTABLE_BACKOFF_MAX = 30.0
+AIRTABLE_RATE_LIMIT_LOCKOUT = 30.0      # wait after a 429 that has no usable Retry-After
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# ---------------- SESSION ----------------
+
+def make_session(headers):
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class RequestThrottle:
+    """Spaces requests at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# ---------------- SHARED CLIENT ----------------
+
+# The scraper and the analyzer write to the same base, and the pipeline runs
+# them at once, so they share one session and one throttle: two throttles
+# would together send twice the per-base rate.
+AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN")
+AIRTABLE_HEADERS = {
+    "Authorization": f"Bearer {AIRTABLE_TOKEN}",
+    "Content-Type": "application/json"
+}
+AIRTABLE_SESSION = make_session(AIRTABLE_HEADERS)
+AIRTABLE_THROTTLE = RequestThrottle(AIRTABLE_REQUESTS_PER_SECOND)
+
+def send_with_retry(session, throttle, method, url, payload=None, params=None, max_attempts=AIRTABLE_MAX_ATTEMPTS):
+    """
+    Send one throttled request, retrying 429/5xx and connection errors with
+    exponential backoff. A 429 without a usable Retry-After waits out the
+    whole AIRTABLE_RATE_LIMIT_LOCKOUT, since retrying earlier only lands in
+    the lockout again. Returns the final response, or None if the request
+    never got one.
+    """
+    response = None
+    for attempt in range(max_attempts):
+        throttle.wait()
+        try:
+            with METRICS.span(f"airtable.{method.lower()}"):
+                response = session.request(method, url, json=payload, params=params, timeout=30)
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            status = response.status_code
+            retry_after = response.headers.get("Retry-After")
+            reason = f"status {status}"
+        except requests.RequestException as e:
+            status = retry_after = None
+            reason = e.__class__.__name__
+
+        if attempt == max_attempts - 1:
+            break
+        METRICS.count("airtable.retry")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(AIRTABLE_BACKOFF_MAX, AIRTABLE_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+            if status == 429:
+                delay = max(delay, AIRTABLE_RATE_LIMIT_LOCKOUT)
+        print(f"Airtable {method} failed ({reason}), retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return response
+
+def list_records(url, params, session=AIRTABLE_SESSION, throttle=AIRTABLE_THROTTLE):
+    """
+    Yield every record of a list query, one page at a time. Pages are
+    throttled and retried like writes; a page that still fails raises
+    rather than passing for the end of the table.
+    """
+    params = dict(params)
+    while True:
+        response = send_with_retry(session, throttle, "GET", url, params=params)
+        if response is None:
+            raise requests.ConnectionError(f"Airtable GET {url} got no response")
+        response.raise_for_status()
+        data = response.json()
+        yield from data.get("records", [])
+        if not data.get("offset"):
+            return
+        params["offset"] = data["offset"]
+
+# ---------------- BATCH WRITER ----------------
+
+class AirtableBatchWriter:
+    """
+    Buffers record writes and sends them AIRTABLE_BATCH_SIZE at a time over a
+    pooled session, throttled to the per-base rate limit. Use method="PATCH"
+    for updates ({"id", "fields"} records) and method="POST" for creates
+    ({"fields"} records). Records whose batch still fails after retries are
+    collected in `failed`. If given, on_batch(batch, stored) is called after
+    every send so callers can checkpoint what has been written; `stored` is
+    the list of records Airtable returned (with their IDs), or None if the
+    batch failed. Safe to share between threads.
+    """
+
+    def __init__(self, url, headers, method="PATCH", session=None, throttle=None,
+                 batch_size=AIRTABLE_BATCH_SIZE, on_batch=None):
+        self.url = url
+        self.method = method
+        self.session = session or make_session(headers)
+        self.throttle = throttle or RequestThrottle(AIRTABLE_REQUESTS_PER_SECOND)
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+        self.failed = []
+        self.batches_sent = 0
+        self.on_batch = on_batch
+        self.lock = threading.RLock()
+
+    def add(self, record):
+        with self.lock:
+            self.pending.append(record)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self.lock:
+            while self.pending:
+                batch, self.pending = self.pending[:self.batch_size], self.pending[self.batch_size:]
+                self._send(batch)
+
+    def _send(self, batch):
+        self.batches_sent += 1
+        response = send_with_retry(self.session, self.throttle, self.method, self.url, {"records": batch})
+
+        ok = response is not None and response.ok
+        if ok:
+            self.written += len(batch)
+        else:
+            error = response.text if response is not None else "no response"
+            print(f"Airtable batch {self.method} failed for {len(batch)} records:", error)
+            METRICS.count("airtable.failed_records", len(batch))
+            self.failed.extend(batch)
+
+        if self.on_batch:
+            self.on_batch(batch, response.json().get("records", []) if ok else None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
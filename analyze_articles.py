@@ -1,18 +1,27 @@
 import os
-import requests
+import atexit
 import json
 import re
 import csv
-import pickle
-import nltk
-from openai import OpenAI
-from nltk.sentiment import SentimentIntensityAnalyzer
+import hashlib
+import shutil
+import tempfile
+import sqlite3
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+import numpy as np
+from collections import deque, namedtuple
+
+from airtable_client import AIRTABLE_SESSION, AIRTABLE_THROTTLE, AirtableBatchWriter, list_records
+from article_store import AIRTABLE_SYNC, ANALYSIS_COLUMNS, ARTICLE_COLUMNS, ARTICLE_STORE_FILE, ArticleStore
+from instrumentation import METRICS
+from near_duplicates import StoryIndex, canonicalize_url
 
 # ---------------- SETUP ----------------
 
-nltk.download("vader_lexicon", quiet=True)
-sia = SentimentIntensityAnalyzer()
-
 AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -25,40 +34,215 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-CACHE_FILE = "lexicon_cache.pkl"
+LEXICON_CACHE_DIR = os.getenv("LEXICON_CACHE_DIR", "lexicon_cache")
+LEXICON_FORMAT_VERSION = 1
+LEXICON_SOURCES = (
+    "LoughranMcDonald_2016.csv",
+    "NRC-Emotion-Lexicon-Wordlevel-v0.92.txt",
+    "Hindi-NRC-EmoLex.txt",
+    "NRC-Emotion-Intensity-Lexicon-v1.txt",
+)
+LLM_MODEL = "gpt-4o-mini"
+# Bump whenever build_prompt() or compress_article() changes so cached analyses are not reused.
+PROMPT_VERSION = 2
+# Article tokens sent per call; the instructions add roughly 600 more.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1000"))
+PROMPT_ENCODING = "o200k_base"      # gpt-4o family tokenizer
+SENTENCE_MAX_WORDS = 60             # unpunctuated runs are split into pieces this long
+ANALYSIS_CACHE_FILE = os.getenv("ANALYSIS_CACHE_FILE", "analysis_cache.sqlite3")
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "50000"))
+STORY_INDEX_FILE = os.getenv("STORY_INDEX_FILE", "story_index.sqlite3")
+# NLTK data directory searched first for the VADER lexicon, and where it is
+# downloaded to if no NLTK data directory has it.
+NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", "nltk_data")
+
+# LLM request budgeting. Defaults sit below the gpt-4o-mini tier-1 limits.
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "450"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "180000"))
+LLM_RESPONSE_TOKENS = 800
+LLM_MAX_ATTEMPTS = 6
+LLM_BACKOFF_BASE = 1.0
+LLM_BACKOFF_MAX = 60.0
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
 WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
 
+# ---------------- LAZY RESOURCES ----------------
+
+# The VADER analyzer, the OpenAI client, the compiled lexicons, the tokenizer
+# and the SQLite stores are built on first use, not at import, so tooling
+# that only needs the cleaning or formatting helpers starts fast, works
+# offline and leaves no files behind. They read as module attributes
+# (analyze_articles.LEXICAL); assigning one replaces the resource, and
+# warm_up() builds them ahead of time.
+
+_RESOURCE_FACTORIES = {}
+_resource_lock = threading.RLock()
+
+def lazy_resource(name):
+    """Register the decorated zero-argument function as the builder of resource `name`."""
+    def register(factory):
+        _RESOURCE_FACTORIES[name] = factory
+        return factory
+    return register
+
+def resource(name):
+    """The shared resource `name`, built on first use."""
+    namespace = globals()
+    try:
+        return namespace[name]
+    except KeyError:
+        pass
+    with _resource_lock:
+        if name not in namespace:
+            with METRICS.span(f"analyzer.init.{name}"):
+                namespace[name] = _RESOURCE_FACTORIES[name]()
+        return namespace[name]
+
+def __getattr__(name):
+    if name in _RESOURCE_FACTORIES:
+        return resource(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warm_up(names=None):
+    """
+    Build the given resources (default: all of them) now rather than on
+    first use. Returns the seconds each one took; ones already built take 0.
+    """
+    timings = {}
+    for name in names or _RESOURCE_FACTORIES:
+        started = time.perf_counter()
+        resource(name)
+        timings[name] = time.perf_counter() - started
+    return timings
+
+# ---------------- CLEANING ENGINE ----------------
+
+DEVANAGARI = re.compile("[\u0900-\u097F]")
+
+class LineFilter:
+    """
+    A declarative line-cleaning rule set. Drop markers are located with
+    whole-text scans, then each line is visited once. Lines are stripped; a line is
+    dropped if it is empty, contains any drop marker, starts with a drop
+    prefix (case-insensitive), or has fewer than min_words words (unless
+    keep_short_devanagari and it contains Devanagari), or is all caps with
+    fewer than max_upper_words words. Kept lines are joined with spaces.
+    """
+
+    def __init__(self, drop_markers=(), drop_prefixes=(), min_words=0,
+                 keep_short_devanagari=False, max_upper_words=0, collapse_whitespace=False):
+        self.markers = tuple(drop_markers)
+        self.drop_prefixes = tuple(drop_prefixes)
+        self.min_words = min_words
+        self.keep_short_devanagari = keep_short_devanagari
+        self.max_upper_words = max_upper_words
+        self.collapse_whitespace = collapse_whitespace
+        # Word counts only matter up to the largest threshold, so split() can stop there.
+        self.max_split = max(min_words, max_upper_words) - 1
+
+    def marked_lines(self, text):
+        """Indices of lines containing a drop marker, from whole-text scans rather than per-line checks."""
+        hits = []
+        for marker in self.markers:
+            start = text.find(marker)
+            while start >= 0:
+                hits.append(start)
+                start = text.find(marker, start + 1)
+
+        marked = set()
+        line_no = counted_to = 0
+        for start in sorted(hits):
+            line_no += text.count("\n", counted_to, start)
+            counted_to = start
+            marked.add(line_no)
+        return marked
+
+    def __call__(self, text):
+        lines = text.split("\n")
+        marked = self.marked_lines(text)
+        if marked:
+            lines = [line for i, line in enumerate(lines) if i not in marked]
+        lines = filter(None, map(str.strip, lines))
+
+        drop_prefixes = self.drop_prefixes
+        min_words, max_upper_words, max_split = self.min_words, self.max_upper_words, self.max_split
+        keep_short_devanagari = self.keep_short_devanagari
+
+        if not drop_prefixes and max_split < 0:
+            kept = lines
+        else:
+            kept = []
+            for line in lines:
+                if drop_prefixes and line.lower().startswith(drop_prefixes):
+                    continue
+
+                if max_split >= 0:
+                    n_words = len(line.split(None, max_split))
+                    if n_words < min_words:
+                        if keep_short_devanagari and DEVANAGARI.search(line):
+                            kept.append(line)
+                        continue
+                    if n_words < max_upper_words and line.isupper():
+                        continue
+
+                kept.append(line)
+
+        joined = " ".join(kept)
+        # str.split() and the regex \s share the same notion of whitespace, so
+        # this equals re.sub(r"\s+", " ", joined).strip() at a fraction of the cost.
+        return " ".join(joined.split()) if self.collapse_whitespace else joined
+
+CLEANING_RULES = {
+    "live": LineFilter(drop_markers=["Updated:", "LIVE"], min_words=3),
+    "hindi_shortform": LineFilter(drop_markers=["विज्ञापन"]),
+    "news": LineFilter(
+        drop_markers=[
+            "Curated By", "Updated:", "Published:", "Last Updated",
+            "Follow us", "Subscribe", "Watch:", "Advertisement", "pic.twitter.com",
+        ],
+        drop_prefixes=("photo", "image"),
+        min_words=4,
+        keep_short_devanagari=True,
+        max_upper_words=8,
+        collapse_whitespace=True,
+    ),
+}
+
+# Publishers whose pages need a specific rule set; others fall back to
+# hindi_shortform for Devanagari text and whitespace-only cleaning otherwise.
+PUBLISHER_RULES = {
+    "News18": "live",
+    "ABP India": "live",
+}
+
+BOILERPLATE_MARKERS = [
+    "First Published:", "Last Updated:", "Newsletter",
+    "Disclaimer:", "Loading comments",
+    "News18 Newsletter", "ABP Live", "Follow Us On",
+    "ALSO READ", "Read More", "Advertisement"
+]
+
 # ---------------- PUBLISHER-SPECIFIC CLEANERS (NEW) ----------------
 
 def clean_generic(text):
-    return re.sub(r"\s+", " ", text).strip()
+    return " ".join(text.split())
 
 def clean_live_style(text):
-    lines = text.split("\n")
-    cleaned = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if "Updated:" in line or "LIVE" in line:
-            continue
-        if len(line.split()) < 3:
-            continue
-        cleaned.append(line)
-    return " ".join(cleaned)
+    return CLEANING_RULES["live"](text)
 
 def clean_hindi_shortform(text):
-    lines = text.split("\n")
-    cleaned = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if "विज्ञापन" in line:
-            continue
-        cleaned.append(line)
-    return " ".join(cleaned)
+    return CLEANING_RULES["hindi_shortform"](text)
+
+@METRICS.timed("analyzer.clean")
+def clean_for_publisher(publisher, text):
+    rule = PUBLISHER_RULES.get(publisher)
+    if rule:
+        return CLEANING_RULES[rule](text)
+    if contains_devanagari(text):
+        return clean_hindi_shortform(text)
+    return clean_generic(text)
 
 # ---------------- TEXT CLEANING ----------------
 
@@ -68,55 +252,22 @@ def clean_text(text):
     return text.strip()
 
 def strip_boilerplate(text):
-    cut_markers = [
-        "First Published:", "Last Updated:", "Newsletter",
-        "Disclaimer:", "Loading comments",
-        "News18 Newsletter", "ABP Live", "Follow Us On",
-        "ALSO READ", "Read More", "Advertisement"
-    ]
-    for marker in cut_markers:
-        if marker in text:
-            text = text.split(marker)[0]
-    return text
+    """Cut the text at boilerplate markers, checking markers in list order."""
+    # Cutting at one marker can remove later markers' occurrences, so a
+    # marker only applies if its first occurrence still fits inside the
+    # text cut so far. str.find is the fastest scan CPython offers here.
+    cut = len(text)
+    for marker in BOILERPLATE_MARKERS:
+        start = text.find(marker, 0, cut)
+        if start >= 0:
+            cut = start
+    return text[:cut]
 
 def contains_devanagari(text):
-    return any('\u0900' <= c <= '\u097F' for c in text)
+    return DEVANAGARI.search(text) is not None
 
 def normalize_news_article(text):
-    lines = text.split("\n")
-    cleaned_lines = []
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if any(x in line for x in [
-            "Curated By", "Updated:", "Published:", "Last Updated",
-            "Follow us", "Subscribe", "Watch:", "Advertisement"
-        ]):
-            continue
-
-        if line.lower().startswith(("photo", "image")):
-            continue
-
-        if "pic.twitter.com" in line:
-            continue
-
-        words = line.split()
-
-        if len(words) < 4:
-            if contains_devanagari(line):
-                cleaned_lines.append(line)
-            continue
-
-        if line.isupper() and len(words) < 8:
-            continue
-
-        cleaned_lines.append(line)
-
-    article_body = " ".join(cleaned_lines)
-    return re.sub(r"\s+", " ", article_body).strip()
+    return CLEANING_RULES["news"](text)
 
 def is_probably_hindi(text):
     return contains_devanagari(text)
@@ -168,62 +319,253 @@ def build_lexicons():
 
     return LM_NEGATIVE, LM_UNCERTAINTY, EMOLEX, BWS_LEXICON
 
+def lexicon_source_digest():
+    """Hash of the source lexicon files and the cache format, used as the cache key."""
+    digest = hashlib.sha256(f"format-{LEXICON_FORMAT_VERSION}".encode())
+    for path in LEXICON_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(path.encode() + b"\0" + hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+@METRICS.timed("analyzer.lexicon_build")
+def rebuild_lexicon_cache(digest=None):
+    digest = digest or lexicon_source_digest()
+    compiled = CompiledLexicon.from_lexicons(*build_lexicons())
+
+    os.makedirs(LEXICON_CACHE_DIR, exist_ok=True)
+    target = os.path.join(LEXICON_CACHE_DIR, digest)
+    staging = tempfile.mkdtemp(dir=LEXICON_CACHE_DIR, prefix=".build-")
+    os.chmod(staging, 0o755)
+    compiled.save(staging)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+
+    for name in os.listdir(LEXICON_CACHE_DIR):
+        if name != digest and not name.startswith("."):
+            shutil.rmtree(os.path.join(LEXICON_CACHE_DIR, name), ignore_errors=True)
+    return target
+
+@METRICS.timed("analyzer.lexicon_load")
 def load_or_build_lexicons():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "rb") as f:
-            return pickle.load(f)
-    lexicons = build_lexicons()
-    with open(CACHE_FILE, "wb") as f:
-        pickle.dump(lexicons, f)
-    return lexicons
-
-LM_NEGATIVE, LM_UNCERTAINTY, EMOLEX, BWS_LEXICON = load_or_build_lexicons()
+    digest = lexicon_source_digest()
+    path = os.path.join(LEXICON_CACHE_DIR, digest)
+    if not os.path.isdir(path):
+        path = rebuild_lexicon_cache(digest)
+    return CompiledLexicon.load(path)
+
+# ---------------- LEXICAL FEATURES ----------------
+
+TRACKED_EMOTIONS = ("anger", "fear", "trust", "joy", "disgust")
+LM_NEGATIVE_FLAG = 1
+LM_UNCERTAINTY_FLAG = 2
+
+# Row m holds the per-emotion bits of emotion mask m, so a histogram of masks
+# times this matrix gives per-emotion counts.
+_MASK_BITS = (np.arange(1 << len(TRACKED_EMOTIONS))[:, None] >> np.arange(len(TRACKED_EMOTIONS))) & 1
+
+class LexicalResult(namedtuple("LexicalResult", [
+    "word_count", "lm_negative", "lm_uncertainty", "emotions", "bws_intensity", "vader_compound"
+])):
+    """Compact per-article lexical signals produced by LexicalFeatures.extract()."""
+    __slots__ = ()
+
+    @property
+    def economic_risk(self):
+        return (self.lm_negative + 1.5 * self.lm_uncertainty) / (self.word_count or 1)
+
+    @property
+    def threat_signal(self):
+        return self.emotions["anger"] + self.emotions["fear"] + self.emotions["disgust"]
+
+class CompiledLexicon:
+    """
+    LM, EmoLex and BWS merged into one sorted vocabulary with flat per-ID tables:
+    a tracked-emotion bitmask, an LM flag byte and a BWS score. The word at
+    vocab[i] has ID i + 1; ID 0 is reserved for out-of-vocabulary tokens and
+    scores zero everywhere. All four arrays can be memory-mapped from disk.
+    """
+
+    ARRAYS = ("vocab", "emotion_mask", "lm_flags", "bws_scores")
+
+    def __init__(self, vocab, emotion_mask, lm_flags, bws_scores):
+        self.vocab = vocab
+        self.emotion_mask = emotion_mask
+        self.lm_flags = lm_flags
+        self.bws_scores = bws_scores
+        # Token -> ID through a dict: hashing each token is several times
+        # faster than a binary search over the unicode vocab array.
+        self.word_ids = {word: i for i, word in enumerate(vocab.tolist(), start=1)}
+
+    @classmethod
+    def from_lexicons(cls, lm_negative, lm_uncertainty, emolex, bws_lexicon):
+        words = sorted(set(lm_negative) | set(lm_uncertainty) | set(emolex) | set(bws_lexicon))
+        ids = {w: i for i, w in enumerate(words, start=1)}
+        size = len(words) + 1
+
+        emotion_mask = np.zeros(size, dtype=np.uint8)
+        lm_flags = np.zeros(size, dtype=np.uint8)
+        bws_scores = np.zeros(size, dtype=np.float64)
+
+        for word, emos in emolex.items():
+            for bit, emo in enumerate(TRACKED_EMOTIONS):
+                if emo in emos:
+                    emotion_mask[ids[word]] |= 1 << bit
+        for word in lm_negative:
+            lm_flags[ids[word]] |= LM_NEGATIVE_FLAG
+        for word in lm_uncertainty:
+            lm_flags[ids[word]] |= LM_UNCERTAINTY_FLAG
+        for word, score in bws_lexicon.items():
+            bws_scores[ids[word]] = score
+
+        return cls(np.array(words, dtype=str), emotion_mask, lm_flags, bws_scores)
+
+    def save(self, path):
+        for name in self.ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, path):
+        return cls(*(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in cls.ARRAYS))
+
+    def token_ids(self, text):
+        words = WORD_PATTERN.findall(text.lower())
+        lookup = self.word_ids.get
+        return np.fromiter((lookup(w, 0) for w in words), dtype=np.int64, count=len(words))
+
+    def score_ids(self, ids, lengths):
+        """
+        Score a batch of documents given their concatenated token IDs and
+        per-document token counts. Returns (lm_negative, lm_uncertainty,
+        emotion_counts, bws_total) arrays with one row per document.
+        """
+        n_docs = len(lengths)
+        doc_index = np.repeat(np.arange(n_docs), lengths)
+
+        n_masks = _MASK_BITS.shape[0]
+        mask_hist = np.bincount(
+            doc_index * n_masks + self.emotion_mask[ids], minlength=n_docs * n_masks
+        ).reshape(n_docs, n_masks)
+        emotion_counts = mask_hist @ _MASK_BITS
+
+        lm_hist = np.bincount(doc_index * 4 + self.lm_flags[ids], minlength=n_docs * 4).reshape(n_docs, 4)
+        lm_negative = lm_hist[:, LM_NEGATIVE_FLAG] + lm_hist[:, LM_NEGATIVE_FLAG | LM_UNCERTAINTY_FLAG]
+        lm_uncertainty = lm_hist[:, LM_UNCERTAINTY_FLAG] + lm_hist[:, LM_NEGATIVE_FLAG | LM_UNCERTAINTY_FLAG]
+
+        bws_total = np.bincount(doc_index, weights=self.bws_scores[ids], minlength=n_docs)
+        return lm_negative, lm_uncertainty, emotion_counts, bws_total
+
+class LexicalFeatures:
+    """
+    Tokenizes a text once and computes every lexicon-based signal from the
+    compiled lookup tables: LM negative/uncertainty counts, the EmoLex emotion
+    profile, BWS intensity and (optionally) the VADER compound score.
+    """
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+
+    @METRICS.timed("analyzer.lexical")
+    def extract(self, text, vader=True):
+        result = self.extract_batch([text])[0]
+        return self.with_vader(result, text) if vader else result
+
+    def extract_batch(self, texts):
+        """Score many documents with one gather/bincount pass. VADER is not run."""
+        id_arrays = [self.compiled.token_ids(t) for t in texts]
+        lengths = np.fromiter((len(a) for a in id_arrays), dtype=np.int64, count=len(id_arrays))
+        ids = np.concatenate(id_arrays) if id_arrays else np.zeros(0, dtype=np.int64)
+        lm_neg, lm_unc, emotion_counts, bws_total = self.compiled.score_ids(ids, lengths)
+
+        results = []
+        for i, word_count in enumerate(lengths.tolist()):
+            counts = emotion_counts[i].tolist()
+            emo_total = sum(counts) or 1
+            results.append(LexicalResult(
+                word_count=word_count,
+                lm_negative=int(lm_neg[i]),
+                lm_uncertainty=int(lm_unc[i]),
+                emotions={k: v / emo_total for k, v in zip(TRACKED_EMOTIONS, counts)},
+                bws_intensity=float(bws_total[i]) / (word_count or 1),
+                vader_compound=None,
+            ))
+        return results
+
+    def salience(self, texts):
+        """
+        Lexicon hits per document (LM negative/uncertainty, tracked emotions
+        and BWS intensity mass), damped by sqrt(length) so that long
+        sentences do not win on size alone. Returns a float array.
+        """
+        id_arrays = [self.compiled.token_ids(t) for t in texts]
+        lengths = np.fromiter((len(a) for a in id_arrays), dtype=np.int64, count=len(id_arrays))
+        ids = np.concatenate(id_arrays) if id_arrays else np.zeros(0, dtype=np.int64)
+        lm_neg, lm_unc, emotion_counts, bws_total = self.compiled.score_ids(ids, lengths)
+        hits = lm_neg + lm_unc + emotion_counts.sum(axis=1) + bws_total
+        return hits / np.sqrt(np.maximum(lengths, 1))
+
+    @METRICS.timed("analyzer.vader")
+    def with_vader(self, result, text):
+        if result.vader_compound is not None:
+            return result
+        return result._replace(vader_compound=vader_emotional_score(text))
+
+@lazy_resource("LEXICAL")
+def load_lexical_features():
+    return LexicalFeatures(load_or_build_lexicons())
 
 # ---------------- SCORING FUNCTIONS ----------------
 
+@lazy_resource("sia")
+def load_vader():
+    """
+    VADER with its lexicon from NLTK_DATA_DIR or NLTK's usual data path. The
+    network is only touched when neither has it, to download it into
+    NLTK_DATA_DIR for next time.
+    """
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    data_dir = os.path.abspath(NLTK_DATA_DIR)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    try:
+        return SentimentIntensityAnalyzer()
+    except LookupError:
+        print(f"VADER lexicon not found locally, downloading it to {data_dir}")
+        nltk.download("vader_lexicon", download_dir=data_dir, quiet=True)
+        return SentimentIntensityAnalyzer()
+
 def vader_emotional_score(text):
-    return sia.polarity_scores(text)["compound"]
+    return resource("sia").polarity_scores(text)["compound"]
 
-def derive_sentiment_label(text):
-    score = vader_emotional_score(text)
+def sentiment_label_from_score(score):
     if score >= 0.05:
         return "Positive"
     elif score <= -0.05:
         return "Negative"
     return "Neutral"
 
+def derive_sentiment_label(text):
+    return sentiment_label_from_score(vader_emotional_score(text))
+
 def economic_risk_score(text):
-    words = WORD_PATTERN.findall(text.lower())
-    total = len(words) or 1
-    neg = sum(1 for w in words if w in LM_NEGATIVE)
-    unc = sum(1 for w in words if w in LM_UNCERTAINTY)
-    return (neg + 1.5 * unc) / total
+    return resource("LEXICAL").extract(text, vader=False).economic_risk
 
 def emotion_profile(text):
-    words = WORD_PATTERN.findall(text.lower())
-    emotions = {"anger": 0, "fear": 0, "trust": 0, "joy": 0, "disgust": 0}
-    for w in words:
-        if w in EMOLEX:
-            for emo in EMOLEX[w]:
-                if emo in emotions:
-                    emotions[emo] += 1
-    total = sum(emotions.values()) or 1
-    return {k: v / total for k, v in emotions.items()}
+    return resource("LEXICAL").extract(text, vader=False).emotions
 
 def bws_intensity_score(text):
-    words = WORD_PATTERN.findall(text.lower())
-    total = len(words) or 1
-    return sum(BWS_LEXICON.get(w, 0) for w in words) / total
+    return resource("LEXICAL").extract(text, vader=False).bws_intensity
 
 def threat_signal_score(text):
-    emotions = emotion_profile(text)
-    return emotions["anger"] + emotions["fear"] + emotions["disgust"]
+    return resource("LEXICAL").extract(text, vader=False).threat_signal
 
-def compute_composite_ideology(framing, intensity, text):
-    vader_score = vader_emotional_score(text)
-    econ_score = economic_risk_score(text)
-    emotions = emotion_profile(text)
-    bws_score = bws_intensity_score(text)
+def compute_composite_ideology(framing, intensity, text, features=None):
+    lexical = resource("LEXICAL")
+    features = lexical.with_vader(features or lexical.extract(text), text)
+    vader_score = features.vader_compound
+    econ_score = features.economic_risk
+    emotions = features.emotions
+    bws_score = features.bws_intensity
 
     base = framing * (0.6 + 0.4 * intensity)
     emotional_mult = 1 + abs(vader_score) if vader_score < 0 else 1
@@ -270,8 +612,10 @@ def format_behavioural_analysis(behaviour):
 
 # ---------------- LLM ANALYSIS ----------------
 
-def analyze_article(text):
-    prompt = f"""
+# The instructions never change between articles, so they are rendered (and
+# measured) once and every prompt shares the same prefix, which also lets the
+# API's prompt caching apply to it.
+PROMPT_INSTRUCTIONS = """
 You are analyzing a news article from TWO independent perspectives:
 
 --------------------------------------------------
@@ -317,114 +661,699 @@ OUTPUT FORMAT
 
 Return ONLY valid JSON with this structure:
 
-{{
+{
   "framing_direction": number,
   "language_intensity": number,
   "sensationalism_score": number,
   "topic": "1-3 word topic label",
 
-  "bias_explanation": {{
+  "bias_explanation": {
       "framing_reason": "",
       "intensity_reason": "",
       "sensationalism_reason": "",
       "overall_interpretation": ""
-  }},
+  },
 
-  "behavioural_analysis": {{
+  "behavioural_analysis": {
       "attention_and_salience": "",
       "emotional_triggers": "",
       "social_and_identity_cues": "",
       "motivation_and_action_signals": "",
       "overall_behavioural_interpretation": ""
-  }}
-}}
+  }
+}
 
 Article:
-{text[:4000]}
 """
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?\u0964\u0965])\s+")
+
+@lazy_resource("tokenizer")
+def load_tokenizer():
+    """The model's tokenizer, or None when tiktoken or its encoding file is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(PROMPT_ENCODING).encode_ordinary
+    except Exception as e:
+        print(f"tiktoken unavailable ({e.__class__.__name__}), estimating tokens from byte length")
+        return None
+
+def count_tokens(text):
+    """
+    Token count under the model's tokenizer when tiktoken and its encoding
+    file are available, otherwise a UTF-8 bytes / 4 estimate (which stays
+    conservative for Devanagari, where one character is three bytes).
+    """
+    tokenizer = resource("tokenizer")
+    if tokenizer:
+        return len(tokenizer(text))
+    return (len(text.encode("utf-8")) + 3) // 4
+
+@lazy_resource("PROMPT_INSTRUCTION_TOKENS")
+def count_instruction_tokens():
+    return count_tokens(PROMPT_INSTRUCTIONS)
+
+def split_sentences(text):
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(" ".join(text.split())):
+        words = sentence.split()
+        for i in range(0, len(words), SENTENCE_MAX_WORDS):
+            sentences.append(" ".join(words[i:i + SENTENCE_MAX_WORDS]))
+    return sentences
+
+@METRICS.timed("analyzer.prompt")
+def compress_article(text, budget=PROMPT_TOKEN_BUDGET):
+    """
+    Fit an article into `budget` tokens. Articles that already fit are only
+    whitespace-normalized. Longer ones keep the lede plus the sentences with
+    the highest lexicon salience per token, in their original order, so the
+    model sees the charged passages instead of whatever happens to come
+    first.
+    """
+    text = " ".join(text.split())
+    if count_tokens(text) <= budget:
+        return text
+
+    sentences = split_sentences(text)
+    costs = [count_tokens(s) + 1 for s in sentences]
+    salience = resource("LEXICAL").salience(sentences)
+    # The lede carries who/what/where context, so it is always considered first.
+    salience[0] = np.inf
+    order = np.argsort(-salience / np.asarray(costs), kind="stable")
+
+    chosen, used = [], 0
+    for i in order.tolist():
+        if used + costs[i] <= budget:
+            chosen.append(i)
+            used += costs[i]
+    if not chosen:
+        # Budget smaller than any sentence: keep a proportional word prefix of the lede.
+        words = sentences[0].split()
+        return " ".join(words[:max(1, len(words) * budget // costs[0])])
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+def build_prompt(excerpt):
+    return PROMPT_INSTRUCTIONS + excerpt + "\n"
+
+class RateBudget:
+    """
+    Sliding one-minute request and token budget shared by all LLM workers.
+    acquire() blocks until the call fits in both limits.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, window=60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self.lock = threading.Lock()
+        self.calls = deque()
+        self.tokens_in_window = 0
+
+    def acquire(self, tokens):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0][0] >= self.window:
+                    self.tokens_in_window -= self.calls.popleft()[1]
+
+                fits_requests = len(self.calls) < self.requests_per_minute
+                fits_tokens = self.tokens_in_window + tokens <= self.tokens_per_minute
+                if not self.calls or (fits_requests and fits_tokens):
+                    self.calls.append((now, tokens))
+                    self.tokens_in_window += tokens
+                    return
+                wait = self.window - (now - self.calls[0][0])
+            time.sleep(max(wait, 0.01))
+
+LLM_BUDGET = RateBudget(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+
+def estimate_tokens(excerpt):
+    return resource("PROMPT_INSTRUCTION_TOKENS") + count_tokens(excerpt) + LLM_RESPONSE_TOKENS
+
+def call_with_backoff(call, max_attempts=LLM_MAX_ATTEMPTS):
+    """Run an OpenAI call, retrying 429/5xx and connection errors with exponential backoff."""
+    import openai
+    for attempt in range(max_attempts):
+        retry_after = None
+        try:
+            with METRICS.span("openai.chat"):
+                return call()
+        except openai.APIConnectionError as e:
+            error = e
+        except openai.APIStatusError as e:
+            if e.status_code not in RETRYABLE_STATUS:
+                raise
+            error = e
+            retry_after = e.response.headers.get("retry-after")
+
+        if attempt == max_attempts - 1:
+            raise error
+        METRICS.count("llm.retry")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+        print(f"LLM call failed ({error.__class__.__name__}), retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+@lazy_resource("client")
+def make_openai_client():
+    from openai import OpenAI
+    # Retries are handled by call_with_backoff so they share the rate budget.
+    return OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+
+def request_analysis(excerpt):
+    prompt = build_prompt(excerpt)
+    with METRICS.span("analyzer.rate_wait"):
+        LLM_BUDGET.acquire(estimate_tokens(excerpt))
+    client = resource("client")
+    response = call_with_backoff(lambda: client.chat.completions.create(
+        model=LLM_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.2,
         response_format={"type": "json_object"}
-    )
+    ))
     return json.loads(response.choices[0].message.content)
 
-# ---------------- AIRTABLE ----------------
-
-def get_unprocessed_articles():
-    records, offset = [], None
-    while True:
-        params = {"offset": offset} if offset else {}
-        res = requests.get(AIRTABLE_URL, headers=HEADERS, params=params)
-        data = res.json()
-        records.extend(data.get("records", []))
-        offset = data.get("offset")
-        if not offset:
-            break
-    return [r for r in records if not r["fields"].get("Processed")]
-
-def update_record(record_id, fields):
-    requests.patch(f"{AIRTABLE_URL}/{record_id}", headers=HEADERS, json={"fields": fields})
-
-# ---------------- MAIN ----------------
-
-def main():
-    articles = get_unprocessed_articles()
-
-    for article in articles:
-        headline = article["fields"].get("Headline", "Untitled")
-        publisher = article["fields"].get("Publisher Name", "")
-        raw_content = article["fields"].get("Content", "")
-
-        if publisher in ["News18", "ABP India"]:
-            content = clean_live_style(raw_content)
-        elif any('\u0900' <= c <= '\u097F' for c in raw_content):
-            content = clean_hindi_shortform(raw_content)
-        else:
-            content = clean_generic(raw_content)
-
-        word_count = len(WORD_PATTERN.findall(content))
-        char_count = len(content)
-
-        if word_count < 40 and char_count < 250:
-            continue
+def analyze_article(text, story_cluster=None, story_key=None):
+    """
+    LLM analysis of one article, cached under its prompt excerpt so that a
+    changed body or cleaning rule gets a fresh analysis. Given the article's
+    near-duplicate story cluster and its own story key, the cluster's
+    representative (story_key == story_cluster) also files its analysis
+    under the cluster, and other members reuse that instead of making their
+    own LLM call. Members of a cluster whose representative has no analysis
+    yet share whichever member's arrives first.
+    """
+    excerpt = compress_article(text)
+    cache = resource("ANALYSIS_CACHE")
+    key = cache.key(excerpt, PROMPT_VERSION, LLM_MODEL)
+
+    def own_analysis():
+        return cache.get_or_compute(key, lambda: request_analysis(excerpt))
+
+    if not story_cluster:
+        return own_analysis()
+    cluster_key = cache.key(f"story-cluster:{story_cluster}", PROMPT_VERSION, LLM_MODEL)
+    if story_cluster == story_key:
+        return cache.refresh(cluster_key, own_analysis)
+    return cache.get_or_compute(cluster_key, own_analysis)
+
+# ---------------- ANALYSIS CACHE ----------------
+
+class AnalysisCache:
+    """
+    Persistent SQLite cache of LLM analyses, keyed by a hash of the normalized
+    prompt text, the prompt version and the model. Least-recently-used rows are
+    evicted once the cache holds more than max_entries. Concurrent lookups for
+    the same key wait for the first caller instead of repeating the LLM call.
+    """
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.inflight = {}
+        self.db = None
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def key(text, prompt_version, model):
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{prompt_version}\0{model}\0{normalized}".encode()).hexdigest()
+
+    def _connect(self):
+        if self.db is None:
+            self.db = sqlite3.connect(self.path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "key TEXT PRIMARY KEY, analysis TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+        return self.db
+
+    def _get(self, key):
+        db = self._connect()
+        row = db.execute("SELECT analysis FROM analyses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+        db.commit()
+        return json.loads(row[0])
+
+    def _put(self, key, analysis):
+        db = self._connect()
+        db.execute(
+            "INSERT OR REPLACE INTO analyses (key, analysis, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(analysis), time.time())
+        )
+        (count,) = db.execute("SELECT COUNT(*) FROM analyses").fetchone()
+        if count > self.max_entries:
+            # Evict down to 90% so we don't pay for a delete on every insert.
+            excess = count - int(self.max_entries * 0.9)
+            db.execute(
+                "DELETE FROM analyses WHERE key IN "
+                "(SELECT key FROM analyses ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+        db.commit()
+
+    def get_or_compute(self, key, compute):
+        with self.lock:
+            cached = self._get(key)
+            if cached is not None:
+                self.hits += 1
+                METRICS.count("analysis_cache.hit")
+                return cached
+            waiter = self.inflight.get(key)
+            if waiter is None:
+                self.inflight[key] = threading.Event()
+
+        if waiter is not None:
+            waiter.wait()
+            with self.lock:
+                cached = self._get(key)
+                if cached is not None:
+                    self.hits += 1
+                    METRICS.count("analysis_cache.hit")
+                    return cached
+            # The first caller failed; fall through and try ourselves.
 
         try:
-            analysis = analyze_article(content)
-
-            framing = analysis["framing_direction"]
-            intensity = analysis["language_intensity"]
-            sensational = analysis["sensationalism_score"]
+            with self.lock:
+                self.misses += 1
+            METRICS.count("analysis_cache.miss")
+            analysis = compute()
+            with self.lock:
+                self._put(key, analysis)
+            return analysis
+        finally:
+            if waiter is None:
+                with self.lock:
+                    self.inflight.pop(key).set()
+
+    def refresh(self, key, compute):
+        """
+        Replace the entry for `key` with a freshly computed one. Concurrent
+        get_or_compute() callers for the key wait for it rather than
+        computing their own.
+        """
+        with self.lock:
+            waiter = self.inflight.get(key)
+            if waiter is None:
+                self.inflight[key] = threading.Event()
+        if waiter is not None:
+            waiter.wait()
+        try:
+            analysis = compute()
+            with self.lock:
+                self._put(key, analysis)
+            return analysis
+        finally:
+            if waiter is None:
+                with self.lock:
+                    self.inflight.pop(key).set()
+
+    def summary(self):
+        return f"Analysis cache: {self.hits} hits, {self.misses} misses, {self.evictions} evicted"
+
+lazy_resource("ANALYSIS_CACHE")(lambda: AnalysisCache(ANALYSIS_CACHE_FILE, ANALYSIS_CACHE_MAX_ENTRIES))
+lazy_resource("STORY_INDEX")(lambda: StoryIndex(STORY_INDEX_FILE))
+lazy_resource("ARTICLE_STORE")(lambda: ArticleStore(ARTICLE_STORE_FILE))
 
-            ai_threat = threat_signal_score(content)
-            ai_lex_intensity = bws_intensity_score(content)
+# ---------------- AIRTABLE ----------------
 
-            sentiment_label = "Neutral" if is_probably_hindi(content) else derive_sentiment_label(content)
-            econ_score = 0 if is_probably_hindi(content) else economic_risk_score(content)
+# Everything the article store keeps, so imported records get their
+# publication date (and so their day) and author, plus the body to analyze.
+ANALYSIS_INPUT_FIELDS = list(ARTICLE_COLUMNS) + ["Content"]
+UNPROCESSED_FORMULA = "NOT({Processed})"
+# Records fetched by ID per request; keeps the formula well inside URL limits.
+RECORD_ID_BATCH = 50
+
+AIRTABLE_WRITER = AirtableBatchWriter(AIRTABLE_URL, HEADERS, session=AIRTABLE_SESSION, throttle=AIRTABLE_THROTTLE)
+atexit.register(AIRTABLE_WRITER.flush)
+
+def iter_unprocessed_articles():
+    """
+    Yield unprocessed records page by page. Filtering and field projection
+    happen on Airtable's side, so processed rows and unused fields are never
+    downloaded, and only one page is held in memory at a time.
+
+    Records are marked processed while we are still paging, which can shift
+    the filtered result under the offset cursor and skip some. So the query
+    is repeated for record IDs only until a pass turns up none we haven't
+    yielded, and just those records are downloaded in full.
+    """
+    seen = set()
+    for record in list_records(AIRTABLE_URL, {"filterByFormula": UNPROCESSED_FORMULA, "fields[]": ANALYSIS_INPUT_FIELDS}):
+        seen.add(record["id"])
+        yield record
 
-            composite_score = compute_composite_ideology(framing, intensity, content)
-            political_leaning = derive_political_leaning(framing, econ_score)
+    while True:
+        missed = [
+            record["id"]
+            for record in list_records(AIRTABLE_URL, {"filterByFormula": UNPROCESSED_FORMULA, "fields[]": ["URL"]})
+            if record["id"] not in seen
+        ]
+        if not missed:
+            return
+        seen.update(missed)
+        for i in range(0, len(missed), RECORD_ID_BATCH):
+            formula = "OR(" + ", ".join(f"RECORD_ID() = '{rid}'" for rid in missed[i:i + RECORD_ID_BATCH]) + ")"
+            yield from list_records(AIRTABLE_URL, {"filterByFormula": formula, "fields[]": ANALYSIS_INPUT_FIELDS})
+
+def iter_records(formula, fields):
+    """Yield every record matching `formula`, projected to `fields`, one page at a time."""
+    return list_records(AIRTABLE_URL, {"filterByFormula": formula, "fields[]": fields, "pageSize": 100})
+
+def iter_pending_articles():
+    """
+    Yield {"id", "key", "fields"} records that still need analysis: first
+    from the local article store, then (when syncing) unprocessed Airtable
+    records. Airtable records the store doesn't know are imported into it.
+    Ones it has already analyzed get the stored analysis patched back
+    instead of a new LLM call.
+    """
+    store = resource("ARTICLE_STORE")
+    yielded = set()
+    for article in store.iter_unprocessed():
+        yielded.add(article["key"])
+        yield article
+
+    if not AIRTABLE_SYNC:
+        return
+    for record in iter_unprocessed_articles():
+        url = record["fields"].get("URL")
+        if not url:
+            continue
+        key = store.add(record["fields"], airtable_id=record["id"])
+        if key in yielded:
+            continue
+        stored = store.analysis_fields(key)
+        if stored:
+            update_record(record["id"], stored)
+            continue
+        yielded.add(key)
+        yield {"id": record["id"], "key": key, "fields": record["fields"]}
 
-            update_record(article["id"], {
-                "Composite Ideology Score": composite_score,
-                "Political Leaning": political_leaning,
-                "Sentiment": sentiment_label,
-                "Topic": analysis["topic"],
-                "Bias Explanation": format_bias_explanation(analysis["bias_explanation"]),
-                "Behavioural Analysis": format_behavioural_analysis(analysis["behavioural_analysis"]),
-                "Processed": True,
-                "AI Framing Direction": framing,
-                "AI Language Intensity": intensity,
-                "AI Sensationalism": sensational,
-                "AI Threat Signal": ai_threat,
-                "AI Lexical Emotional Intensity": ai_lex_intensity
-            })
+def update_record(record_id, fields):
+    """Queue an update; it is sent with the next batch of AIRTABLE_BATCH_SIZE records."""
+    AIRTABLE_WRITER.add({"id": record_id, "fields": fields})
+
+# ---------------- RESCORING ----------------
+
+# Stored LLM outputs plus the current lexical fields, so unchanged rows can be skipped.
+RESCORE_OUTPUT_FIELDS = [
+    "Composite Ideology Score", "Political Leaning", "Sentiment",
+    "AI Threat Signal", "AI Lexical Emotional Intensity",
+]
+RESCORE_INPUT_FIELDS = [
+    "Publisher Name", "Content", "AI Framing Direction", "AI Language Intensity",
+] + RESCORE_OUTPUT_FIELDS
+RESCORE_EXPORT_FILE = os.getenv("RESCORE_EXPORT_FILE", "archive_export.jsonl")
+RESCORE_CHUNK_SIZE = 64
+# Everything the article store keeps, for backfilling it from Airtable.
+ARCHIVE_FIELDS = list(ARTICLE_COLUMNS) + ["Content"] + list(ANALYSIS_COLUMNS)
+ARCHIVE_IMPORT_FILE = os.getenv("ARCHIVE_IMPORT_FILE", "archive_import.jsonl")
+
+def export_archive(path=RESCORE_EXPORT_FILE, fields=RESCORE_INPUT_FIELDS):
+    """Download `fields` of every processed record to a JSONL file."""
+    count = 0
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for record in iter_records("{Processed}", fields):
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+def iter_chunks(path, size=RESCORE_CHUNK_SIZE):
+    chunk = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def import_archive(path=ARCHIVE_IMPORT_FILE):
+    """
+    Load an ARCHIVE_FIELDS export into the article store, so analytics cover
+    articles analyzed before the store existed. Articles the store has
+    already analyzed keep their stored analysis. Returns (articles, analyses)
+    imported.
+    """
+    store = resource("ARTICLE_STORE")
+    articles = analyses = 0
+    for chunk in iter_chunks(path):
+        for record in chunk:
+            fields = record["fields"]
+            if not fields.get("URL"):
+                continue
+            key = store.add(fields, airtable_id=record["id"])
+            articles += 1
+            if store.analysis_fields(key) is None:
+                store.save_analysis(key, fields)
+                analyses += 1
+    store.checkpoint()
+    return articles, analyses
+
+def fields_changed(old, new):
+    for name, value in new.items():
+        stored = old.get(name)
+        if isinstance(value, float) and isinstance(stored, (int, float)):
+            if abs(value - stored) > 1e-9 * max(1.0, abs(value)):
+                return True
+        elif value != stored:
+            return True
+    return False
+
+def rescore_chunk(records):
+    """
+    Recompute the lexical fields for a chunk of exported records. Runs in a
+    worker process; the compiled lexicon arrays are memory-mapped from
+    LEXICON_CACHE_DIR, so every worker reads the same page-cache copy and
+    only the article text crosses the process boundary. Returns
+    (record_id, fields, changed) for each record that was scored.
+    """
+    scored = []
+    for record in records:
+        fields = record["fields"]
+        framing = fields.get("AI Framing Direction")
+        intensity = fields.get("AI Language Intensity")
+        if framing is None or intensity is None:
+            continue
+        scored.append((record, clean_for_publisher(fields.get("Publisher Name", ""), fields.get("Content", "")),
+                       framing, intensity))
+
+    batch = resource("LEXICAL").extract_batch([content for _, content, _, _ in scored])
+    results = []
+    for (record, content, framing, intensity), features in zip(scored, batch):
+        new_fields = lexical_fields(content, features, framing, intensity)
+        results.append((record["id"], new_fields, fields_changed(record["fields"], new_fields)))
+    return results
+
+def rescore(path=RESCORE_EXPORT_FILE, workers=None, output=None):
+    """
+    Re-derive the lexicon/VADER fields for every article in a local export
+    using stored LLM outputs only. Chunks fan out over a process pool; changed
+    rows are PATCHed in batches, or written to `output` as JSONL instead.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Built before the pool starts so forked workers inherit them.
+    warm_up(["LEXICAL", "sia"])
+    store = resource("ARTICLE_STORE")
+    started = time.perf_counter()
+    scored = changed = 0
+    out = open(output, "w", encoding="utf-8") if output else None
+
+    def collect(future):
+        nonlocal scored, changed
+        for record_id, fields, is_changed in future.result():
+            scored += 1
+            if not is_changed:
+                continue
+            changed += 1
+            if out:
+                out.write(json.dumps({"id": record_id, "fields": fields}) + "\n")
+                continue
+            key = store.key_for(record_id)
+            if key:
+                store.save_analysis(key, fields)
+            if AIRTABLE_SYNC:
+                update_record(record_id, fields)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in iter_chunks(path):
+                pending.add(pool.submit(rescore_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+            for future in as_completed(pending):
+                collect(future)
+    finally:
+        if out:
+            out.close()
+
+    AIRTABLE_WRITER.flush()
+    store.checkpoint()
+    elapsed = time.perf_counter() - started
+    rate = scored / elapsed if elapsed else 0.0
+    print(f"Rescored {scored} articles in {elapsed:.1f}s on {workers} processes: "
+          f"{rate:.0f} articles/s, {rate / workers:.0f} articles/s/core; {changed} changed")
+    if AIRTABLE_WRITER.failed:
+        print(f"Airtable updates failed for {len(AIRTABLE_WRITER.failed)} records")
+    METRICS.export()
 
-            print(f"Processed: {headline}")
+# ---------------- MAIN ----------------
 
-        except Exception as e:
-            print(f"Failed: {headline}", e)
+@METRICS.timed("analyzer.score")
+def score_article(article):
+    """
+    Clean, lexically score and LLM-analyze one record. Runs on a worker thread.
+    Returns the Airtable fields to write. An article too short to analyze
+    only gets marked processed, so it isn't downloaded again every run.
+    """
+    publisher = article["fields"].get("Publisher Name", "")
+    raw_content = article["fields"].get("Content", "")
+
+    content = clean_for_publisher(publisher, raw_content)
+
+    features = resource("LEXICAL").extract(content, vader=False)
+    char_count = len(content)
+
+    if features.word_count < 40 and char_count < 250:
+        METRICS.count("analyzer.short_text_skipped")
+        return {"Processed": True}
+
+    # Lexical scores below are always per article; only the LLM call is shared.
+    url = article["fields"].get("URL")
+    story_key = canonicalize_url(url) if url else article["id"]
+    with METRICS.span("analyzer.story_index"):
+        cluster = resource("STORY_INDEX").assign(story_key, content)
+    analysis = analyze_article(content, cluster, story_key)
+
+    framing = analysis["framing_direction"]
+    intensity = analysis["language_intensity"]
+    sensational = analysis["sensationalism_score"]
+
+    return {
+        **lexical_fields(content, features, framing, intensity),
+        "Topic": analysis["topic"],
+        "Bias Explanation": format_bias_explanation(analysis["bias_explanation"]),
+        "Behavioural Analysis": format_behavioural_analysis(analysis["behavioural_analysis"]),
+        "Processed": True,
+        "AI Framing Direction": framing,
+        "AI Language Intensity": intensity,
+        "AI Sensationalism": sensational,
+    }
+
+@METRICS.timed("analyzer.lexical_fields")
+def lexical_fields(content, features, framing, intensity):
+    """
+    The Airtable fields derived from lexicons and VADER, given the cleaned
+    content, its LexicalResult and the stored LLM framing/intensity. Shared
+    by fresh analysis and `rescore`, so both produce identical values.
+    """
+    features = resource("LEXICAL").with_vader(features, content)
+    hindi = is_probably_hindi(content)
+
+    sentiment_label = "Neutral" if hindi else sentiment_label_from_score(features.vader_compound)
+    econ_score = 0 if hindi else features.economic_risk
+
+    return {
+        "Composite Ideology Score": compute_composite_ideology(framing, intensity, content, features),
+        "Political Leaning": derive_political_leaning(framing, econ_score),
+        "Sentiment": sentiment_label,
+        "AI Threat Signal": features.threat_signal,
+        "AI Lexical Emotional Intensity": features.bws_intensity,
+    }
+
+def write_back(article, future):
+    headline = article["fields"].get("Headline", "Untitled")
+    try:
+        fields = future.result()
+        resource("ARTICLE_STORE").save_analysis(article["key"], fields)
+        if AIRTABLE_SYNC and article["id"]:
+            update_record(article["id"], fields)
+        print(f"Processed: {headline}")
+
+    except Exception as e:
+        print(f"Failed: {headline}", e)
+        METRICS.count("analyzer.failed")
+
+def main(concurrency=LLM_CONCURRENCY):
+    concurrency = max(1, concurrency)
+    max_in_flight = concurrency * 2
+    warm_up()
+
+    # Records stream in page by page while earlier ones are analyzed on the
+    # worker pool. Each result is written back as soon as it completes, and
+    # fetching pauses once max_in_flight articles are waiting.
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = {}
+
+        for article in iter_pending_articles():
+            pending[pool.submit(score_article, article)] = article
+
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write_back(pending.pop(future), future)
+
+        for future in as_completed(list(pending)):
+            write_back(pending.pop(future), future)
+
+    AIRTABLE_WRITER.flush()
+    resource("ARTICLE_STORE").checkpoint()
+    if AIRTABLE_WRITER.failed:
+        print(f"Airtable updates failed for {len(AIRTABLE_WRITER.failed)} records")
+    print(resource("ANALYSIS_CACHE").summary())
+    METRICS.export()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Analyze unprocessed articles from the article store and Airtable.")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY,
+                        help="number of articles analyzed in parallel (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="analyze unprocessed articles (default)")
+    commands.add_parser("rebuild-lexicons", help="rebuild the memory-mapped lexicon cache from the source files")
+    commands.add_parser("warm-up", help="load (and if needed fetch or build) VADER, the lexicons and the tokenizer")
+    export_parser = commands.add_parser("export", help="download processed articles for offline rescoring")
+    export_parser.add_argument("--output", default=RESCORE_EXPORT_FILE)
+    import_parser = commands.add_parser(
+        "import-archive", help="backfill the local article store with every processed Airtable record"
+    )
+    import_parser.add_argument("--file", default=ARCHIVE_IMPORT_FILE, help="where the download is kept")
+    import_parser.add_argument("--no-download", action="store_true", help="import an existing download")
+    rescore_parser = commands.add_parser(
+        "rescore", help="recompute lexical scores from an export using stored LLM outputs"
+    )
+    rescore_parser.add_argument("--input", default=RESCORE_EXPORT_FILE)
+    rescore_parser.add_argument("--workers", type=int, default=None,
+                                help="worker processes (default: all cores)")
+    rescore_parser.add_argument("--output", help="write changed fields to this JSONL file instead of Airtable")
+    args = parser.parse_args()
+
+    if args.command == "rebuild-lexicons":
+        print("Lexicon cache written to", rebuild_lexicon_cache())
+    elif args.command == "warm-up":
+        for name, seconds in warm_up(["sia", "LEXICAL", "tokenizer", "PROMPT_INSTRUCTION_TOKENS"]).items():
+            print(f"  {name:<26} {seconds:6.2f} s")
+    elif args.command == "export":
+        print(f"Exported {export_archive(args.output)} records to {args.output}")
+    elif args.command == "import-archive":
+        if not args.no_download:
+            print(f"Downloaded {export_archive(args.file, ARCHIVE_FIELDS)} records to {args.file}")
+        articles, analyses = import_archive(args.file)
+        print(f"Imported {articles} articles ({analyses} new analyses) into {ARTICLE_STORE_FILE}")
+    elif args.command == "rescore":
+        rescore(args.input, workers=args.workers, output=args.output)
+    else:
+        main(concurrency=args.concurrency)
@@ -0,0 +1,432 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from near_duplicates import canonicalize_url
+
+# ---------------- SETUP ----------------
+
+ARTICLE_STORE_FILE = os.getenv("ARTICLE_STORE_FILE", "articles.sqlite3")
+# Set AIRTABLE_SYNC=0 to keep everything local; Airtable is only a downstream copy.
+AIRTABLE_SYNC = os.getenv("AIRTABLE_SYNC", "1") != "0"
+
+# Airtable field name -> column. Records enter and leave the store in
+# Airtable's shape, so the scraper and analyzer code is the same either way.
+ARTICLE_COLUMNS = {
+    "Headline": "headline",
+    "Author": "author",
+    "Publisher Name": "publisher",
+    "Publication Date & Time": "published",
+    "URL": "url",
+}
+ANALYSIS_COLUMNS = {
+    "Composite Ideology Score": "composite_score",
+    "Political Leaning": "political_leaning",
+    "Sentiment": "sentiment",
+    "Topic": "topic",
+    "Bias Explanation": "bias_explanation",
+    "Behavioural Analysis": "behavioural_analysis",
+    "AI Framing Direction": "framing_direction",
+    "AI Language Intensity": "language_intensity",
+    "AI Sensationalism": "sensationalism",
+    "AI Threat Signal": "threat_signal",
+    "AI Lexical Emotional Intensity": "lexical_intensity",
+}
+
+# Numeric columns aggregated per publisher x day x topic, with the range their
+# histogram covers (values outside it land in the edge bins).
+AGGREGATE_METRICS = {
+    "framing_direction": (-1.0, 1.0),
+    "language_intensity": (0.0, 1.0),
+    "sensationalism": (0.0, 1.0),
+    "composite_score": (-3.0, 3.0),
+    "threat_signal": (0.0, 1.0),
+    "lexical_intensity": (0.0, 1.0),
+}
+# Label columns aggregated as per-value counts, stored as metric "column=value".
+AGGREGATE_LABELS = ("political_leaning", "sentiment")
+HISTOGRAM_BINS = 10
+GROUP_COLUMNS = ("day", "publisher", "topic")
+
+def topic_key(topic):
+    """LLM topic labels vary in case and spacing; aggregates group on this form."""
+    return " ".join((topic or "").lower().split())
+
+# Range of a metric over one aggregate group's articles. Plain IS comparisons
+# (no COALESCE) so SQLite can seek the articles_day_publisher index; add()
+# stores unknown days and publishers as NULL, which the '' group maps back to.
+GROUP_EXTREMES_SQL = (
+    "SELECT MIN({metric}), MAX({metric}) FROM articles "
+    "WHERE day IS ? AND publisher IS ? AND processed = 1 AND topic_key(topic) = ?"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,                -- canonical URL
+    airtable_id TEXT,
+    url TEXT NOT NULL,
+    headline TEXT,
+    author TEXT,
+    publisher TEXT,
+    published TEXT,                      -- ISO 8601, UTC
+    day TEXT,                            -- YYYY-MM-DD of published
+    scraped_at REAL NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    analyzed_at REAL,
+    composite_score REAL,
+    political_leaning TEXT,
+    sentiment TEXT,
+    topic TEXT,
+    bias_explanation TEXT,
+    behavioural_analysis TEXT,
+    framing_direction REAL,
+    language_intensity REAL,
+    sensationalism REAL,
+    threat_signal REAL,
+    lexical_intensity REAL
+);
+-- Bodies live apart from the row data so that analytics scans never page
+-- through 100 kB content blobs.
+CREATE TABLE IF NOT EXISTS contents (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+-- Covers the per-day, per-publisher analytics queries without touching the table.
+CREATE INDEX IF NOT EXISTS articles_day_publisher
+    ON articles (day, publisher, processed, composite_score, political_leaning);
+CREATE INDEX IF NOT EXISTS articles_pending ON articles (key) WHERE processed = 0;
+CREATE INDEX IF NOT EXISTS articles_airtable_id ON articles (airtable_id);
+-- Running totals per publisher x day x topic, updated with every analysis.
+-- Group columns use '' for unknown values.
+CREATE TABLE IF NOT EXISTS aggregates (
+    day TEXT NOT NULL,
+    publisher TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    min REAL,
+    max REAL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (day, publisher, topic, metric)
+);
+CREATE INDEX IF NOT EXISTS aggregates_metric ON aggregates (metric, day);
+"""
+
+# ---------------- STORE ----------------
+
+class ArticleStore:
+    """
+    Local SQLite system of record for scraped articles and their analyses.
+    Rows are keyed by canonical URL and remember their Airtable record ID
+    once one exists. Safe to share between threads.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, path=ARTICLE_STORE_FILE):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.create_function("topic_key", 1, topic_key, deterministic=True)
+        new_aggregates = not self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aggregates'"
+        ).fetchone()
+        self.db.executescript(SCHEMA)
+        if new_aggregates:
+            self.rebuild_aggregates()
+
+    def add(self, record, airtable_id=None):
+        """Store a scraped record (Airtable field names). Returns its key; existing rows are kept."""
+        key = canonicalize_url(record["URL"])
+        row = {column: record.get(field) for field, column in ARTICLE_COLUMNS.items()}
+        published = row["published"] or ""
+        with self.lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO articles "
+                "(key, airtable_id, url, headline, author, publisher, published, day, scraped_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, airtable_id, row["url"], row["headline"], row["author"], row["publisher"] or None,
+                 published or None, published[:10] or None, time.time())
+            )
+            self.db.execute(
+                "INSERT OR IGNORE INTO contents (key, content) VALUES (?, ?)", (key, record.get("Content", ""))
+            )
+            if airtable_id:
+                self.db.execute(
+                    "UPDATE articles SET airtable_id = ? WHERE key = ? AND airtable_id IS NULL", (airtable_id, key)
+                )
+            self.db.commit()
+        return key
+
+    def link(self, url, airtable_id):
+        with self.lock:
+            self.db.execute("UPDATE articles SET airtable_id = ? WHERE key = ?", (airtable_id, canonicalize_url(url)))
+            self.db.commit()
+
+    def contains(self, url):
+        with self.lock:
+            row = self.db.execute("SELECT 1 FROM articles WHERE key = ?", (canonicalize_url(url),)).fetchone()
+        return row is not None
+
+    def key_for(self, airtable_id):
+        with self.lock:
+            row = self.db.execute("SELECT key FROM articles WHERE airtable_id = ?", (airtable_id,)).fetchone()
+        return row[0] if row else None
+
+    def save_analysis(self, key, fields):
+        """
+        Record an analysis given in Airtable field names, mark the article
+        processed and update the aggregates in the same transaction. A
+        re-scored article's previous values are taken out of its groups
+        before the new ones go in.
+        """
+        updates = {column: fields[field] for field, column in ANALYSIS_COLUMNS.items() if field in fields}
+        assignments = "".join(f", {column} = ?" for column in updates)
+        with self.lock, self.db:
+            old = self._aggregate_row(key)
+            self.db.execute(
+                f"UPDATE articles SET processed = 1, analyzed_at = ?{assignments} WHERE key = ?",
+                (time.time(), *updates.values(), key)
+            )
+            if old is not None:
+                self._apply(old, -1)
+            new = self._aggregate_row(key)
+            if new is not None:
+                self._apply(new, +1)
+
+    def analysis_fields(self, key):
+        """A processed article's stored analysis in Airtable field names, or None."""
+        columns = ", ".join(ANALYSIS_COLUMNS.values())
+        with self.lock:
+            row = self.db.execute(
+                f"SELECT {columns} FROM articles WHERE key = ? AND processed = 1", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        fields = {field: value for field, value in zip(ANALYSIS_COLUMNS, row) if value is not None}
+        fields["Processed"] = True
+        return fields
+
+    def iter_unprocessed(self):
+        """
+        Yield unprocessed articles as {"id", "key", "fields"} records, where id
+        is the Airtable record ID (or None). Rows are read a page at a time in
+        key order, so articles marked processed meanwhile are simply passed.
+        """
+        last = ""
+        while True:
+            with self.lock:
+                rows = self.db.execute(
+                    "SELECT a.key, a.airtable_id, a.headline, a.publisher, a.url, c.content "
+                    "FROM articles a JOIN contents c ON c.key = a.key "
+                    "WHERE a.processed = 0 AND a.key > ? ORDER BY a.key LIMIT ?",
+                    (last, self.PAGE_SIZE)
+                ).fetchall()
+            for key, airtable_id, headline, publisher, url, content in rows:
+                yield {
+                    "id": airtable_id,
+                    "key": key,
+                    "fields": {"Headline": headline, "Publisher Name": publisher, "URL": url, "Content": content},
+                }
+            if len(rows) < self.PAGE_SIZE:
+                return
+            last = rows[-1][0]
+
+    def query(self, sql, *params):
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    # ---------------- AGGREGATES ----------------
+
+    def _aggregate_row(self, key):
+        """(group, {metric: value}) for a processed article, or None."""
+        columns = ", ".join((*GROUP_COLUMNS[:2], *AGGREGATE_METRICS, *AGGREGATE_LABELS))
+        row = self.db.execute(
+            f"SELECT topic, {columns} FROM articles WHERE key = ? AND processed = 1", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        topic, day, publisher, *values = row
+        group = (day or "", publisher or "", topic_key(topic))
+        metrics = dict(zip(AGGREGATE_METRICS, values))
+        for label, value in zip(AGGREGATE_LABELS, values[len(AGGREGATE_METRICS):]):
+            metrics[f"{label}={value}"] = None if value is None else 1.0
+        return group, {metric: value for metric, value in metrics.items() if value is not None}
+
+    @staticmethod
+    def _bin(metric, value):
+        low, high = AGGREGATE_METRICS.get(metric, (0.0, 1.0))
+        return min(HISTOGRAM_BINS - 1, max(0, int((value - low) / (high - low) * HISTOGRAM_BINS)))
+
+    def _apply(self, aggregate_row, sign):
+        """Add (sign=+1) or remove (sign=-1) one article's values from its group's aggregates."""
+        group, metrics = aggregate_row
+        for metric, value in metrics.items():
+            row = self.db.execute(
+                "SELECT count, total, total_sq, min, max, histogram FROM aggregates "
+                "WHERE day = ? AND publisher = ? AND topic = ? AND metric = ?", (*group, metric)
+            ).fetchone()
+            count, total, total_sq, low, high, histogram = row or (0, 0.0, 0.0, None, None, "[]")
+            histogram = json.loads(histogram) or [0] * HISTOGRAM_BINS
+            is_label = "=" in metric
+
+            count += sign
+            if count <= 0:
+                self.db.execute(
+                    "DELETE FROM aggregates WHERE day = ? AND publisher = ? AND topic = ? AND metric = ?",
+                    (*group, metric)
+                )
+                continue
+            if not is_label:
+                total += sign * value
+                total_sq += sign * value * value
+                histogram[self._bin(metric, value)] += sign
+                if sign > 0:
+                    low = value if low is None else min(low, value)
+                    high = value if high is None else max(high, value)
+                elif value <= low or value >= high:
+                    # An extreme left the group; the new one comes from the group's
+                    # remaining rows, found through the (day, publisher) index.
+                    low, high = self.db.execute(
+                        GROUP_EXTREMES_SQL.format(metric=metric),
+                        (group[0] or None, group[1] or None, group[2])
+                    ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO aggregates "
+                "(day, publisher, topic, metric, count, total, total_sq, min, max, histogram) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*group, metric, count, total, total_sq, low, high, json.dumps([] if is_label else histogram))
+            )
+
+    def rebuild_aggregates(self):
+        """Recompute every aggregate from the articles table."""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM aggregates")
+            keys = [key for (key,) in self.db.execute("SELECT key FROM articles WHERE processed = 1")]
+            for key in keys:
+                self._apply(self._aggregate_row(key), +1)
+        return len(keys)
+
+    def aggregate(self, metric, by=("publisher",), since=None, until=None, histogram=True, **filters):
+        """
+        Roll a metric up over aggregate groups, e.g. aggregate("framing_direction",
+        by=("day", "publisher"), since="2024-06-01", topic="elections").
+        Numeric metrics give count, mean, stddev, min, max and (unless
+        histogram=False) a histogram per group; label metrics
+        ("political_leaning", "sentiment") give per-value counts. Cost is
+        proportional to the number of stored groups, not articles.
+        """
+        if any(column not in GROUP_COLUMNS for column in (*by, *filters)):
+            raise ValueError(f"group columns must be among {GROUP_COLUMNS}")
+        is_label = metric in AGGREGATE_LABELS
+        where, params = ["metric LIKE ?" if is_label else "metric = ?"], [f"{metric}=%" if is_label else metric]
+        if since:
+            where.append("day >= ?")
+            params.append(since)
+        if until:
+            where.append("day <= ?")
+            params.append(until)
+        for column, value in filters.items():
+            where.append(f"{column} = ?")
+            params.append(topic_key(value) if column == "topic" else value)
+
+        keys = ", ".join((*by, "metric") if is_label else by)
+        select = "SUM(count), SUM(total), SUM(total_sq), MIN(min), MAX(max)"
+        if histogram and not is_label:
+            select += ", GROUP_CONCAT(histogram, '|')"
+        sql = f"SELECT {keys + ', ' if keys else ''}{select} FROM aggregates WHERE {' AND '.join(where)}"
+        if keys:
+            sql += f" GROUP BY {keys} ORDER BY {keys}"
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+
+        results = {}
+        for row in rows:
+            group = row[:len(by)]
+            if is_label:
+                label, count = row[len(by)].split("=", 1)[1], row[len(by) + 1]
+                result = results.setdefault(group, {**dict(zip(by, group)), "count": 0, "counts": {}})
+                result["count"] += count
+                result["counts"][label] = count
+                continue
+
+            count, total, total_sq, low, high = row[len(by):len(by) + 5]
+            if not count:
+                continue
+            mean = total / count
+            result = {
+                **dict(zip(by, group)),
+                "count": count,
+                "mean": mean,
+                "stddev": math.sqrt(max(0.0, total_sq / count - mean * mean)),
+                "min": low,
+                "max": high,
+            }
+            if histogram:
+                result["histogram"] = [sum(bins) for bins in zip(*map(json.loads, row[-1].split("|")))]
+            results[group] = result
+        return list(results.values())
+
+    def leaning_by_publisher_day(self, since=None):
+        """(day, publisher, articles, mean composite score, leaning counts) for processed articles."""
+        by = ("day", "publisher")
+        composite = {
+            (r["day"], r["publisher"]): r for r in self.aggregate("composite_score", by, since=since, histogram=False)
+        }
+        rows = []
+        for r in self.aggregate("political_leaning", by, since=since):
+            score = composite.get((r["day"], r["publisher"]))
+            counts = r["counts"]
+            rows.append((r["day"], r["publisher"], r["count"], score["mean"] if score else None,
+                         counts.get("Left", 0), counts.get("Neutral", 0), counts.get("Right", 0)))
+        return rows
+
+    def checkpoint(self):
+        """
+        Move the WAL into the main database file and truncate it, so that
+        articles.sqlite3 alone holds every committed write. Call at the end
+        of a run, before the file is copied or cached.
+        """
+        with self.lock:
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+# ---------------- MAIN ----------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the local article store.")
+    parser.add_argument("--store", default=ARTICLE_STORE_FILE)
+    commands = parser.add_subparsers(dest="command")
+    report_parser = commands.add_parser("report", help="leaning by publisher per day (default)")
+    report_parser.add_argument("--since", help="first day to include, YYYY-MM-DD")
+    sql_parser = commands.add_parser("sql", help="run a read-only SQL query")
+    sql_parser.add_argument("query")
+    commands.add_parser("rebuild-aggregates", help="recompute aggregates from the articles table")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.store)
+    started = time.perf_counter()
+    if args.command == "rebuild-aggregates":
+        print(f"Rebuilt aggregates from {store.rebuild_aggregates()} articles")
+        rows = []
+    elif args.command == "sql":
+        store.db.execute("PRAGMA query_only = ON")
+        rows = store.query(args.query)
+        for row in rows:
+            print("\t".join("" if v is None else str(v) for v in row))
+    else:
+        rows = store.leaning_by_publisher_day(getattr(args, "since", None))
+        print(f"{'day':<11}{'publisher':<28}{'articles':>9}{'composite':>10}{'left':>6}{'neutral':>8}{'right':>6}")
+        for day, publisher, count, composite, left, neutral, right in rows:
+            print(f"{day or '-':<11}{(publisher or '-')[:27]:<28}{count:>9}{composite or 0:>10.3f}"
+                  f"{left:>6}{neutral:>8}{right:>6}")
+    print(f"{len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
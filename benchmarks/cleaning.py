@@ -0,0 +1,161 @@
+"""
+Compiled LineFilter cleaners vs the original per-line marker scans.
+
+Builds a deterministic fixture corpus of English, Hindi and live-blog style
+articles, checks that every cleaner produces identical output, and times both.
+Run from the repository root:
+
+    python -m benchmarks.cleaning [--articles 300] [--lines 400]
+"""
+import argparse
+import os
+import random
+import re
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import analyze_articles as aa
+
+# ---------------- ORIGINAL CLEANERS (reference) ----------------
+
+def legacy_clean_live_style(text):
+    lines = text.split("\n")
+    cleaned = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if "Updated:" in line or "LIVE" in line:
+            continue
+        if len(line.split()) < 3:
+            continue
+        cleaned.append(line)
+    return " ".join(cleaned)
+
+def legacy_clean_hindi_shortform(text):
+    lines = text.split("\n")
+    cleaned = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if "विज्ञापन" in line:
+            continue
+        cleaned.append(line)
+    return " ".join(cleaned)
+
+def legacy_strip_boilerplate(text):
+    cut_markers = [
+        "First Published:", "Last Updated:", "Newsletter",
+        "Disclaimer:", "Loading comments",
+        "News18 Newsletter", "ABP Live", "Follow Us On",
+        "ALSO READ", "Read More", "Advertisement"
+    ]
+    for marker in cut_markers:
+        if marker in text:
+            text = text.split(marker)[0]
+    return text
+
+def legacy_contains_devanagari(text):
+    return any('ऀ' <= c <= 'ॿ' for c in text)
+
+def legacy_normalize_news_article(text):
+    lines = text.split("\n")
+    cleaned_lines = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if any(x in line for x in [
+            "Curated By", "Updated:", "Published:", "Last Updated",
+            "Follow us", "Subscribe", "Watch:", "Advertisement"
+        ]):
+            continue
+
+        if line.lower().startswith(("photo", "image")):
+            continue
+
+        if "pic.twitter.com" in line:
+            continue
+
+        words = line.split()
+
+        if len(words) < 4:
+            if legacy_contains_devanagari(line):
+                cleaned_lines.append(line)
+            continue
+
+        if line.isupper() and len(words) < 8:
+            continue
+
+        cleaned_lines.append(line)
+
+    article_body = " ".join(cleaned_lines)
+    return re.sub(r"\s+", " ", article_body).strip()
+
+PAIRS = [
+    ("clean_live_style", legacy_clean_live_style, aa.clean_live_style),
+    ("clean_hindi_shortform", legacy_clean_hindi_shortform, aa.clean_hindi_shortform),
+    ("strip_boilerplate", legacy_strip_boilerplate, aa.strip_boilerplate),
+    ("normalize_news_article", legacy_normalize_news_article, aa.normalize_news_article),
+    ("contains_devanagari", legacy_contains_devanagari, aa.contains_devanagari),
+]
+
+# ---------------- FIXTURE CORPUS ----------------
+
+ENGLISH = ("the government said on monday that the opposition had raised concerns over the new "
+           "policy and its impact on farmers in the northern states").split()
+HINDI = "सरकार ने सोमवार को कहा कि विपक्ष ने नई नीति पर चिंता जताई है".split()
+NOISE = [
+    "Updated: 12 Jan 2024, 10:30 IST", "LIVE UPDATES", "Curated By : Staff", "Follow us on X",
+    "Photo: PTI", "image credit reuters", "pic.twitter.com/abc123", "WATCH", "ALSO READ: more news",
+    "Advertisement", "विज्ञापन", "News18 Newsletter signup", "Read More", "Subscribe now",
+    "First Published: Jan 12", "Disclaimer: views are personal", "   ", "", "TOP STORIES TODAY",
+]
+
+def fixture_corpus(n_articles, n_lines, noise=0.1, seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n_articles):
+        lines = []
+        for _ in range(n_lines):
+            roll = rng.random()
+            if roll < noise:
+                lines.append(rng.choice(NOISE))
+            elif roll < 0.4:
+                lines.append(" ".join(rng.choices(HINDI, k=rng.randint(1, 14))))
+            else:
+                lines.append("  " + " ".join(rng.choices(ENGLISH, k=rng.randint(1, 30))) + " ")
+        corpus.append("\n".join(lines))
+    return corpus
+
+# ---------------- BENCHMARK ----------------
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    out = [fn(text) for text in corpus]
+    return time.perf_counter() - start, out
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=400)
+    args = parser.parse_args()
+
+    corpus = fixture_corpus(args.articles, args.lines)
+    print(f"corpus: {len(corpus)} articles, {sum(map(len, corpus)) / 1e6:.1f} M chars")
+
+    for name, legacy, compiled in PAIRS:
+        legacy_time, expected = timed(legacy, corpus)
+        compiled_time, actual = timed(compiled, corpus)
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+        status = "identical" if not mismatches else f"{mismatches} MISMATCHES"
+        print(f"{name:<24} {legacy_time * 1000:8.1f} ms -> {compiled_time * 1000:8.1f} ms  "
+              f"({legacy_time / compiled_time:4.1f}x, {status})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Import-time budget check for analyze_articles.
+
+Imports the module in `--repeat` fresh interpreters, from an empty working
+directory, and fails (exit status 1) if the import raises, if the median
+import takes longer than `--budget` seconds, if it pulls in a module that
+should only load on first use (openai, nltk, tiktoken), or if it leaves files
+in the working directory. One more run under `-X importtime` lists the
+slowest imports. Run from the repository root:
+
+    python -m benchmarks.import_time [--budget 0.5] [--repeat 5] [--module analyze_articles]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_BUDGET = 0.5    # seconds, median over fresh interpreters
+LAZY_MODULES = ("openai", "nltk", "tiktoken")
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def import_once(module, cwd, importtime=False):
+    """Import `module` in a fresh interpreter. Returns (result dict or None if it raised, stderr)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.getenv("PYTHONPATH")])))
+    flags = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", CHILD.format(module=module, lazy=LAZY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        return None, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest(importtime_log, top):
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative | <indent>name", indented two spaces per level.
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:     # the module itself and its direct imports
+            rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="analyze_articles")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="median import time allowed, in seconds")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    args = parser.parse_args()
+
+    # A scratch working directory, so files created by the import are easy to spot.
+    with tempfile.TemporaryDirectory() as cwd:
+        runs = [import_once(args.module, cwd)[0] for _ in range(args.repeat)]
+        profiled, log = import_once(args.module, cwd, importtime=True)
+        left_behind = sorted(os.listdir(cwd))
+
+    if profiled is None or None in runs:
+        print(log.rstrip())
+        print(f"FAIL: import {args.module} raised")
+        sys.exit(1)
+
+    seconds = [run["seconds"] for run in runs]
+    loaded = sorted({m for run in runs + [profiled] for m in run["loaded"]})
+    median = statistics.median(seconds)
+    print(f"import {args.module}: median {median * 1000:.0f} ms, min {min(seconds) * 1000:.0f} ms "
+          f"over {args.repeat} runs (budget {args.budget * 1000:.0f} ms)")
+    print("slowest imports (cumulative, under -X importtime):")
+    for cumulative_us, name in slowest(log, args.top):
+        print(f"  {name:<32} {cumulative_us / 1000:8.1f} ms")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"median import {median:.3f}s is over the {args.budget:.3f}s budget")
+    if loaded:
+        failures.append(f"imported at module load: {', '.join(loaded)}")
+    if left_behind:
+        failures.append(f"files created by the import: {', '.join(left_behind)}")
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Micro-benchmark: per-function lexical scoring vs the single-pass LexicalFeatures engine.
+
+Run from the repository root (the lexicon files are loaded from the working directory):
+
+    python -m benchmarks.lexical [--chars 100000] [--repeat 5] [--batch 2000]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import analyze_articles as aa
+
+LM_NEGATIVE, LM_UNCERTAINTY, EMOLEX, BWS_LEXICON = aa.build_lexicons()
+
+
+def legacy_scores(text):
+    """The call pattern main() used before LexicalFeatures: 8 tokenizations, 2 VADER runs."""
+    def words():
+        return aa.WORD_PATTERN.findall(text.lower())
+
+    def emotions():
+        counts = {"anger": 0, "fear": 0, "trust": 0, "joy": 0, "disgust": 0}
+        for w in words():
+            for emo in EMOLEX.get(w, ()):
+                if emo in counts:
+                    counts[emo] += 1
+        total = sum(counts.values()) or 1
+        return {k: v / total for k, v in counts.items()}
+
+    def econ():
+        ws = words()
+        neg = sum(1 for w in ws if w in LM_NEGATIVE)
+        unc = sum(1 for w in ws if w in LM_UNCERTAINTY)
+        return (neg + 1.5 * unc) / (len(ws) or 1)
+
+    def bws():
+        ws = words()
+        return sum(BWS_LEXICON.get(w, 0) for w in ws) / (len(ws) or 1)
+
+    len(aa.WORD_PATTERN.findall(text))
+    e = emotions()
+    e["anger"] + e["fear"] + e["disgust"]
+    bws()
+    aa.vader_emotional_score(text)
+    econ()
+    aa.vader_emotional_score(text)
+    econ()
+    emotions()
+    bws()
+
+
+def single_pass_scores(text):
+    features = aa.LEXICAL.extract(text, vader=False)
+    aa.LEXICAL.with_vader(features, text)
+
+
+def dict_lookup_batch(texts):
+    """
+    Lexicon-only scoring of a corpus with the dict-of-sets lexicons, one
+    document at a time. Returns (word_count, lm_negative, lm_uncertainty,
+    emotion counts, bws_total) per document.
+    """
+    scores = []
+    for text in texts:
+        counts = {"anger": 0, "fear": 0, "trust": 0, "joy": 0, "disgust": 0}
+        neg = unc = 0
+        bws = 0.0
+        words = aa.WORD_PATTERN.findall(text.lower())
+        for w in words:
+            neg += w in LM_NEGATIVE
+            unc += w in LM_UNCERTAINTY
+            for emo in EMOLEX.get(w, ()):
+                if emo in counts:
+                    counts[emo] += 1
+            bws += BWS_LEXICON.get(w, 0)
+        scores.append((len(words), neg, unc, counts, bws))
+    return scores
+
+
+def mismatches(expected, results):
+    """Documents whose compiled LexicalResult differs from the dict-lookup scores."""
+    bad = 0
+    for (words, neg, unc, counts, bws), r in zip(expected, results, strict=True):
+        total = sum(counts.values()) or 1
+        bad += not (
+            r.word_count == words and r.lm_negative == neg and r.lm_uncertainty == unc
+            and all(math.isclose(r.emotions[k], v / total) for k, v in counts.items())
+            and math.isclose(r.bws_intensity, bws / (words or 1), rel_tol=1e-9, abs_tol=1e-12)
+        )
+    return bad
+
+
+def synthetic_article(chars, seed=0):
+    rng = random.Random(seed)
+    vocab = list(EMOLEX)[:2000] + list(BWS_LEXICON)[:2000] + ["the", "of", "and", "to", "in"] * 200
+    words, size = [], 0
+    while size < chars:
+        w = rng.choice(vocab)
+        words.append(w)
+        size += len(w) + 1
+    return " ".join(words)
+
+
+def best_of(fn, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chars", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=2000, help="documents in the corpus re-scoring run")
+    args = parser.parse_args()
+
+    text = synthetic_article(args.chars)
+    legacy, _ = best_of(legacy_scores, text, args.repeat)
+    single, _ = best_of(single_pass_scores, text, args.repeat)
+
+    print(f"article: {len(text)} chars")
+    print(f"per-function: {legacy * 1000:.1f} ms")
+    print(f"single-pass:  {single * 1000:.1f} ms")
+    print(f"speedup:      {legacy / single:.2f}x")
+
+    corpus = [synthetic_article(3000, seed=i) for i in range(args.batch)]
+    per_doc, expected = best_of(dict_lookup_batch, corpus, 1)
+    batched, results = best_of(aa.LEXICAL.extract_batch, corpus, 1)
+    bad = mismatches(expected, results)
+
+    print(f"\ncorpus: {len(corpus)} docs of ~3000 chars (lexicons only, no VADER)")
+    print(f"dict lookups: {per_doc:.2f} s")
+    print(f"compiled:     {batched:.2f} s")
+    print(f"speedup:      {per_doc / batched:.2f}x")
+    print(f"mismatches:   {bad} of {len(corpus)} docs")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
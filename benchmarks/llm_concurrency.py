@@ -0,0 +1,59 @@
+"""
+Throughput of the LLM analysis stage against a local stub OpenAI server.
+
+Every concurrency level starts from an empty analysis cache in a temporary
+directory, so each one makes the full set of LLM calls and nothing is written
+to the working directory. Run from the repository root:
+
+    python -m benchmarks.llm_concurrency [--articles 48] [--latency 0.25] [--rate-limit-every 10]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from openai import OpenAI
+
+import analyze_articles as aa
+from benchmarks.lexical import synthetic_article
+from benchmarks.stubs import stub_openai
+
+
+def run(texts, concurrency, cache_dir):
+    aa.ANALYSIS_CACHE = aa.AnalysisCache(os.path.join(cache_dir, f"cache-{concurrency}.sqlite3"), len(texts))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in as_completed([pool.submit(aa.analyze_article, t) for t in texts]):
+            future.result()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=48)
+    parser.add_argument("--latency", type=float, default=0.25, help="stub response time in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=10, help="return a 429 every N calls (0 = never)")
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    texts = [synthetic_article(4000, seed=i) for i in range(args.articles)]
+
+    with stub_openai(args.latency, args.rate_limit_every) as server, tempfile.TemporaryDirectory() as cache_dir:
+        aa.client = OpenAI(api_key="benchmark", base_url=server.url + "/v1", max_retries=0)
+        aa.LLM_BUDGET = aa.RateBudget(requests_per_minute=10_000, tokens_per_minute=10_000_000)
+        aa.LLM_BACKOFF_BASE = 0.05
+
+        print(f"{args.articles} articles, stub latency {args.latency * 1000:.0f} ms")
+        for level in (int(x) for x in args.levels.split(",")):
+            before = server.requests
+            elapsed = run(texts, level, cache_dir)
+            print(f"concurrency {level:>3}: {elapsed:6.2f} s  "
+                  f"{args.articles / elapsed:6.1f} articles/s  "
+                  f"({server.requests - before} requests)")
+
+
+if __name__ == "__main__":
+    main()
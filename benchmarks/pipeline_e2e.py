@@ -0,0 +1,484 @@
+"""
+End-to-end benchmark of the hourly scrape-analyze-write pipeline on a recorded corpus.
+
+Replays recorded RSS feeds and article pages, OpenAI analyses and existing
+Airtable records from local stand-in servers, runs pipeline.main() against
+them with fresh state files, and times every stage: download, feed parse,
+each extractor, cleaning, lexical scoring, prompt compression, the LLM call,
+story clustering and write-back. Each repeat runs in its own process so
+imports, caches and peak RSS are measured cold. Results are JSON, so runs on
+different commits can be compared. Run from a checkout with the lexicon
+files in place:
+
+    python -m benchmarks.pipeline_e2e run [--repeat 3] [--latency-scale 1.0] [--output result.json]
+    python -m benchmarks.pipeline_e2e compare base.json new.json
+    python -m benchmarks.pipeline_e2e record [--live] [--output benchmarks/fixtures/pipeline_corpus.json.gz]
+
+To compare commits, run the same fixture and options on each (e.g. from a
+`git worktree`) and pass both result files to `compare`.
+"""
+import argparse
+import contextlib
+import functools
+import gzip
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "pipeline_corpus.json.gz")
+FIXTURE_VERSION = 1
+
+# State files and directories the pipeline creates, pointed into a temporary
+# directory per run so nothing lands in the caller's working directory.
+STATE_FILES = {
+    "URL_INDEX_FILE": "url_index.sqlite3",
+    "AIRTABLE_SPOOL_FILE": "airtable_spool.jsonl",
+    "STORY_INDEX_FILE": "story_index.sqlite3",
+    "ANALYSIS_CACHE_FILE": "analysis_cache.sqlite3",
+    "PIPELINE_JOURNAL_FILE": "pipeline_journal.sqlite3",
+    "ARTICLE_STORE_FILE": "articles.sqlite3",
+    "LEXICON_CACHE_DIR": "lexicon_cache",
+    "NLTK_DATA_DIR": "nltk_data",
+}
+
+# ---------------- FIXTURE ----------------
+
+def load_fixture(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"{path}: fixture version {fixture.get('version')}, expected {FIXTURE_VERSION}")
+    return fixture
+
+
+def fixture_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def write_fixture(fixture, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # No name or mtime in the header keeps the file byte-identical when
+    # re-recorded from the same seed.
+    with open(path, "wb") as raw, gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(json.dumps(fixture, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+def rss(publisher, items):
+    """RSS 2.0 feed for (title, path, age_seconds, summary) items, in the stub's placeholder form."""
+    from xml.sax.saxutils import escape
+    body = "".join(
+        f"<item><title>{escape(title)}</title><link>__BASE__{path}</link>"
+        f"<guid isPermaLink=\"true\">__BASE__{path}</guid><pubDate>__AGE_{age}__</pubDate>"
+        f"<description>{escape(summary)}</description></item>"
+        for title, path, age, summary in items
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{escape(publisher)}</title><link>__BASE__/</link><description>{escape(publisher)} news</description>"
+        f"{body}</channel></rss>"
+    )
+
+
+# Word banks for the synthetic corpus: neutral reporting with charged terms
+# mixed in, so cleaning, lexicons and prompt compression all have work to do.
+NEUTRAL_EN = ("the ministry said on monday that officials met in the district after a report was issued "
+              "according to a statement from the state government and the committee will review the "
+              "proposal before the session next week while residents waited for details").split()
+CHARGED_EN = ("crisis attack violence protest anger fear threat unrest riot collapse scandal corruption "
+              "outrage danger terror clash uncertain risk volatile decline celebrate growth trust hope "
+              "victory reform support justice betrayal chaos").split()
+NEUTRAL_HI = "सरकार ने सोमवार को कहा कि अधिकारियों की बैठक में रिपोर्ट जारी की गई और समिति प्रस्ताव पर विचार करेगी".split()
+CHARGED_HI = "संकट हमला हिंसा विरोध गुस्सा डर खतरा अशांति भ्रष्टाचार घोटाला आतंक उम्मीद भरोसा जीत".split()
+TOPICS = ["Politics", "Economy", "Security", "Health", "Environment", "Elections", "Courts", "Infrastructure"]
+
+
+def synthetic_sentence(rng, neutral, charged, stop):
+    words = [rng.choice(neutral) for _ in range(rng.randint(10, 28))]
+    for _ in range(rng.choice((0, 0, 1, 2, 3))):
+        words[rng.randrange(len(words))] = rng.choice(charged)
+    return " ".join(words).capitalize() + stop
+
+
+def synthetic_page(rng, publisher, headline, style):
+    """One article page with the chrome real publisher pages carry around the body."""
+    hindi = style == "hindi"
+    neutral, charged, stop = (NEUTRAL_HI, CHARGED_HI, "।") if hindi else (NEUTRAL_EN, CHARGED_EN, ".")
+    paragraphs = []
+    for n in range(rng.randint(6, 24)):
+        if style == "live":
+            paragraphs.append(f"<p>LIVE Updated: {n:02d}:{rng.randint(0, 59):02d} IST</p>")
+        text = " ".join(synthetic_sentence(rng, neutral, charged, stop) for _ in range(rng.randint(1, 5)))
+        paragraphs.append(f"<p>{text}</p>")
+        if n % 6 == 5:
+            paragraphs.append(f"<p>ALSO READ: {rng.choice(CHARGED_EN).title()} in the capital</p>")
+        if n % 9 == 4:
+            paragraphs.append('<figure><img src="/img.jpg"><figcaption>Photo: file image</figcaption></figure>')
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(30))
+    related = "".join(f'<li><a href="/story/{rng.randrange(10**6)}">Related story {i}</a></li>' for i in range(12))
+    script = "var slots=[" + ",".join(str(rng.randrange(10**6)) for _ in range(40)) + "];"
+    return (
+        f'<!DOCTYPE html><html lang="{"hi" if hindi else "en"}"><head><meta charset="utf-8">'
+        f"<title>{headline} | {publisher}</title><script>{script}</script>"
+        "<style>.ad{display:block}.nav li{float:left}</style></head><body>"
+        f'<header><nav class="nav"><ul>{nav}</ul></nav></header><div class="ad">Advertisement</div>'
+        f'<main><article><h1>{headline}</h1><div class="byline">By <span itemprop="author">'
+        f"Staff Reporter {rng.randint(1, 40)}</span> | Updated: {rng.randint(1, 28)} Oct 2026</div>"
+        f'<div itemprop="articleBody">{"".join(paragraphs)}</div></article>'
+        f"<aside><h3>Trending</h3><ul>{related}</ul></aside></main>"
+        f"<footer><p>Follow Us On social media. Copyright {publisher}.</p></footer></body></html>"
+    )
+
+
+def synthetic_analysis(rng):
+    reason = lambda: " ".join(rng.choice(NEUTRAL_EN + CHARGED_EN) for _ in range(rng.randint(12, 30)))
+    return {
+        "framing_direction": round(rng.uniform(-1, 1), 2),
+        "language_intensity": round(rng.uniform(0, 1), 2),
+        "sensationalism_score": round(rng.uniform(0, 1), 2),
+        "topic": rng.choice(TOPICS),
+        "bias_explanation": {k: reason() for k in (
+            "framing_reason", "intensity_reason", "sensationalism_reason", "overall_interpretation")},
+        "behavioural_analysis": {k: reason() for k in (
+            "attention_and_salience", "emotional_triggers", "social_and_identity_cues",
+            "motivation_and_action_signals", "overall_behavioural_interpretation")},
+    }
+
+
+def record_synthetic(seed, articles_per_feed, backlog):
+    import news_scraper as scraper
+    rng = random.Random(seed)
+    styles = {"News18": "live", "ABP India": "live", "Storify News": "hindi"}
+    publishers = []
+    for name in scraper.RSS_FEEDS:
+        style = styles.get(name, "news")
+        items, pages = [], []
+        for n in range(articles_per_feed):
+            headline = synthetic_sentence(rng, NEUTRAL_EN, CHARGED_EN, "")[:90]
+            pages.append(synthetic_page(rng, name, headline, style))
+            items.append((headline, f"/page/{n}.html", 300 + n * 1500 + rng.randrange(600), headline))
+        # Older items outside the scraper's window, as real feeds carry them.
+        items += [(f"Archive story {n}", f"/archive/{n}.html", 86400 + n * 3600, "") for n in range(10)]
+        publishers.append({"name": name, "feed": rss(name, items), "pages": pages})
+
+    records = []
+    for n in range(backlog):
+        processed = n % 10 != 0
+        fields = {
+            "Headline": f"Earlier story {n}",
+            "Publisher Name": rng.choice(list(scraper.RSS_FEEDS)),
+            "URL": f"https://archive.example.com/{n}",
+            "Content": " ".join(synthetic_sentence(rng, NEUTRAL_EN, CHARGED_EN, ".") for _ in range(rng.randint(8, 30))),
+        }
+        if processed:
+            fields["Processed"] = True
+        records.append({"id": f"recBACKLOG{n:06d}", "fields": fields})
+
+    return {
+        "version": FIXTURE_VERSION,
+        "source": f"synthetic, seed {seed}",
+        "latency": {"site": 0.08, "openai": 1.0, "airtable": 0.15},
+        "publishers": publishers,
+        "openai": [synthetic_analysis(rng) for _ in range(40)],
+        "airtable": records,
+    }
+
+
+def record_live(articles_per_feed, base):
+    """Capture the real feeds and article pages; analyses and Airtable records come from `base`."""
+    import feedparser
+    import news_scraper as scraper
+    from dateutil import parser as dateparser
+
+    publishers, fetch_times = [], []
+    for name, url in scraper.RSS_FEEDS.items():
+        try:
+            started = time.perf_counter()
+            feed = feedparser.parse(scraper.SESSION.get(url, timeout=scraper.REQUEST_TIMEOUT).content)
+            fetch_times.append(time.perf_counter() - started)
+        except Exception as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        items, pages = [], []
+        now = time.time()
+        for entry in feed.entries[:articles_per_feed]:
+            try:
+                started = time.perf_counter()
+                html = scraper.SESSION.get(entry.link, timeout=scraper.REQUEST_TIMEOUT).text
+                fetch_times.append(time.perf_counter() - started)
+                published = dateparser.parse(entry.get("published") or entry.get("updated")).timestamp()
+            except Exception as e:
+                print(f"Skipping {entry.get('link')}: {e}", file=sys.stderr)
+                continue
+            items.append((entry.title, f"/page/{len(pages)}.html", max(60, int(now - published)) % 18000,
+                          entry.get("summary", "")))
+            pages.append(html)
+        publishers.append({"name": name, "feed": rss(name, items), "pages": pages})
+        print(f"Recorded {name}: {len(pages)} pages", file=sys.stderr)
+
+    fixture = dict(base)
+    fixture["source"] = f"live feeds recorded {time.strftime('%Y-%m-%d')}"
+    fixture["publishers"] = publishers
+    fixture["latency"] = {**base["latency"], "site": round(statistics.median(fetch_times), 3) if fetch_times else 0.08}
+    return fixture
+
+# ---------------- PROBES ----------------
+
+class Probes:
+    """Per-call wall times of wrapped functions, grouped by stage name."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def wrap(self, stage, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self.lock:
+                    self.samples[stage].append(elapsed)
+        return timed
+
+    def patch(self, owner, attr, stage):
+        # Stages missing from an older tree are skipped, so one harness can time any commit.
+        fn = getattr(owner, attr, None)
+        if callable(fn):
+            setattr(owner, attr, self.wrap(stage, fn))
+
+
+def install_probes(probes, scraper, analyzer):
+    from airtable_client import AirtableBatchWriter
+    from article_store import ArticleStore
+
+    probes.patch(scraper, "fetch", "download")
+    probes.patch(scraper.feedparser, "parse", "feed_parse")
+    for name in list(scraper.EXTRACTORS):
+        scraper.EXTRACTORS[name] = probes.wrap(f"extract_{name}", scraper.EXTRACTORS[name])
+    probes.patch(scraper.UrlIndex, "sync", "airtable_sync")
+    probes.patch(analyzer, "score_article", "article")
+    probes.patch(analyzer, "clean_for_publisher", "cleaning")
+    probes.patch(analyzer.LEXICAL, "extract", "lexical")
+    probes.patch(analyzer, "lexical_fields", "lexical_fields")
+    probes.patch(analyzer, "compress_article", "prompt")
+    probes.patch(analyzer, "request_analysis", "llm")
+    probes.patch(analyzer.STORY_INDEX, "assign", "story_index")
+    probes.patch(AirtableBatchWriter, "_send", "airtable_write")
+    probes.patch(ArticleStore, "add", "store_write")
+    probes.patch(ArticleStore, "save_analysis", "store_write")
+
+# ---------------- RUN ----------------
+
+def run_once(fixture_path, latency_scale):
+    """One cold pipeline run in this process; returns raw samples and counters."""
+    fixture = load_fixture(fixture_path)
+    state = tempfile.mkdtemp(prefix="pipeline_e2e_")
+    for var, name in STATE_FILES.items():
+        os.environ[var] = os.path.join(state, name)
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("AIRTABLE_TOKEN", "benchmark")
+    latency = {k: v * latency_scale for k, v in fixture["latency"].items()}
+
+    from benchmarks.stubs import stub_airtable, stub_openai, stub_recorded_site
+
+    with stub_recorded_site(fixture["publishers"], latency["site"]) as site, \
+            stub_openai(latency["openai"], responses=fixture["openai"]) as llm, \
+            stub_airtable(fixture["airtable"], latency=latency["airtable"]) as airtable:
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            started = time.perf_counter()
+            import analyze_articles as analyzer
+            import news_scraper as scraper
+            import pipeline
+            from openai import OpenAI
+            startup = time.perf_counter() - started
+
+            analyzer.client = OpenAI(api_key="benchmark", base_url=llm.url + "/v1", max_retries=0)
+            scraper.AIRTABLE_URL = scraper.UPLOADER.url = airtable.url
+            analyzer.AIRTABLE_URL = analyzer.AIRTABLE_WRITER.url = airtable.url
+
+            probes = Probes()
+            install_probes(probes, scraper, analyzer)
+
+            started = time.perf_counter()
+            pipeline.main(feeds=site.feeds())
+            wall = time.perf_counter() - started
+
+        requests = {"site": site.requests, "openai": llm.requests, "airtable": airtable.requests}
+        created = sum(1 for r in airtable.records.values() if not r["id"].startswith("recBACKLOG"))
+
+    return {
+        "startup_seconds": startup,
+        "wall_seconds": wall,
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+        "samples": dict(probes.samples),
+        "requests": requests,
+        "articles_created": created,
+        "log_lines": log.getvalue().count("\n"),
+    }
+
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def summarize(runs, fixture_path, fixture, latency_scale):
+    """Pool samples across repeats into p50/p95 per stage; run-level numbers are medians."""
+    pooled = defaultdict(list)
+    for run in runs:
+        for stage, samples in run["samples"].items():
+            pooled[stage].extend(samples)
+
+    median = lambda key: statistics.median(run[key] for run in runs)
+    wall = median("wall_seconds")
+    articles = statistics.median(len(run["samples"].get("article", [])) for run in runs)
+    stages = {}
+    for stage in sorted(pooled):
+        samples = pooled[stage]
+        stages[stage] = {
+            "calls_per_run": len(samples) / len(runs),
+            "seconds_per_run": sum(samples) / len(runs),
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "calls_per_second": len(samples) / sum(samples) if sum(samples) else 0.0,
+        }
+
+    return {
+        "benchmark": "pipeline_e2e",
+        "commit": git_revision(),
+        "fixture": {"path": os.path.relpath(fixture_path), "sha256": fixture_digest(fixture_path),
+                    "source": fixture.get("source"),
+                    "pages": sum(len(p["pages"]) for p in fixture["publishers"])},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "repeat": len(runs),
+        "latency_scale": latency_scale,
+        "wall_seconds": wall,
+        "startup_seconds": median("startup_seconds"),
+        "articles_analyzed": articles,
+        "articles_per_second": articles / wall if wall else 0.0,
+        "peak_rss_mb": max(run["peak_rss_bytes"] for run in runs) / 2**20,
+        "requests": {k: statistics.median(run["requests"][k] for run in runs) for k in runs[0]["requests"]},
+        "articles_created": median("articles_created"),
+        "stages": stages,
+    }
+
+
+def print_summary(result):
+    print(f"{result['commit'] or 'unknown commit'}: {result['articles_analyzed']:.0f} articles in "
+          f"{result['wall_seconds']:.2f} s ({result['articles_per_second']:.2f}/s), startup "
+          f"{result['startup_seconds']:.2f} s, peak RSS {result['peak_rss_mb']:.0f} MB, "
+          f"{result['repeat']} run(s), latency x{result['latency_scale']}")
+    print("  requests: " + ", ".join(f"{k} {v:.0f}" for k, v in result["requests"].items()))
+    print(f"  {'stage':<18} {'calls':>7} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for stage, s in result["stages"].items():
+        print(f"  {stage:<18} {s['calls_per_run']:7.0f} {s['seconds_per_run']:9.2f} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f}")
+
+
+def compare(base, new):
+    def delta(a, b):
+        return f"{(b - a) / a:+7.1%}" if a else "    n/a"
+
+    print(f"{base['commit'] or 'unknown'} -> {new['commit'] or 'unknown'}")
+    if base["fixture"]["sha256"] != new["fixture"]["sha256"] or base["latency_scale"] != new["latency_scale"]:
+        print("  warning: different fixture or latency scale, numbers are not comparable")
+    for key in ("wall_seconds", "articles_per_second", "startup_seconds", "peak_rss_mb"):
+        print(f"  {key:<20} {base[key]:10.2f} {new[key]:10.2f} {delta(base[key], new[key])}")
+    print(f"  {'stage':<20} {'p50 ms: base, new, change':>29}  {'p95 ms: base, new, change':>29}")
+    for stage in sorted(set(base["stages"]) | set(new["stages"])):
+        a, b = base["stages"].get(stage), new["stages"].get(stage)
+        if not a or not b:
+            print(f"  {stage:<20} only in {'new' if b else 'base'}")
+            continue
+        print(f"  {stage:<20} {a['p50_ms']:10.2f} {b['p50_ms']:10.2f} {delta(a['p50_ms'], b['p50_ms'])}  "
+              f"{a['p95_ms']:10.2f} {b['p95_ms']:10.2f} {delta(a['p95_ms'], b['p95_ms'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="benchmark the pipeline on a fixture")
+    run_cmd.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    run_cmd.add_argument("--repeat", type=int, default=3)
+    run_cmd.add_argument("--latency-scale", type=float, default=1.0,
+                         help="multiply the recorded service latencies (0 = CPU only)")
+    run_cmd.add_argument("--output", help="write the JSON result here")
+
+    once_cmd = commands.add_parser("once", help=argparse.SUPPRESS)
+    once_cmd.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    once_cmd.add_argument("--latency-scale", type=float, default=1.0)
+
+    compare_cmd = commands.add_parser("compare", help="compare two JSON results")
+    compare_cmd.add_argument("base")
+    compare_cmd.add_argument("new")
+
+    record_cmd = commands.add_parser("record", help="write a fixture")
+    record_cmd.add_argument("--live", action="store_true",
+                            help="capture the real RSS_FEEDS and article pages instead of generating them")
+    record_cmd.add_argument("--seed", type=int, default=23)
+    record_cmd.add_argument("--articles-per-feed", type=int, default=5)
+    record_cmd.add_argument("--backlog", type=int, default=100, help="existing Airtable records")
+    record_cmd.add_argument("--output", default=DEFAULT_FIXTURE)
+
+    args = parser.parse_args()
+
+    if args.command == "once":
+        print(json.dumps(run_once(args.fixture, args.latency_scale)))
+    elif args.command == "run":
+        runs = []
+        for n in range(args.repeat):
+            child = subprocess.run(
+                [sys.executable, "-m", "benchmarks.pipeline_e2e", "once",
+                 "--fixture", args.fixture, "--latency-scale", str(args.latency_scale)],
+                capture_output=True, text=True,
+            )
+            if child.returncode != 0:
+                sys.exit(f"run {n + 1} failed:\n{child.stderr}")
+            runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+            print(f"run {n + 1}/{args.repeat}: {runs[-1]['wall_seconds']:.2f} s", file=sys.stderr)
+        result = summarize(runs, args.fixture, load_fixture(args.fixture), args.latency_scale)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+        print_summary(result)
+    elif args.command == "compare":
+        with open(args.base, encoding="utf-8") as f, open(args.new, encoding="utf-8") as g:
+            compare(json.load(f), json.load(g))
+    elif args.command == "record":
+        os.environ.setdefault("AIRTABLE_TOKEN", "benchmark")
+        fixture = record_synthetic(args.seed, args.articles_per_feed, args.backlog)
+        if args.live:
+            fixture = record_live(args.articles_per_feed, fixture)
+        write_fixture(fixture, args.output)
+        print(f"Wrote {args.output}: {sum(len(p['pages']) for p in fixture['publishers'])} pages, "
+              f"{len(fixture['openai'])} analyses, {len(fixture['airtable'])} Airtable records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Prompt size and retained signal: the old `text[:4000]` cut vs compress_article().
+
+Builds deterministic English and Hindi articles of varying length in which
+charged sentences are scattered through neutral filler, then reports prompt
+tokens per call, the share of the article's lexicon hits that reach the model,
+and the time spent compressing. Run from the repository root:
+
+    python -m benchmarks.prompt_budget [--articles 200] [--budget 1000]
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import analyze_articles as aa
+from benchmarks.lexical import EMOLEX, BWS_LEXICON
+
+LEGACY_PROMPT_CHARS = 4000
+
+FILLER_EN = ["the", "ministry", "said", "on", "monday", "that", "officials", "met", "in", "district",
+             "according", "to", "a", "statement", "report", "was", "issued", "after", "meeting"]
+FILLER_HI = ["सरकार", "ने", "सोमवार", "को", "कहा", "कि", "अधिकारियों", "की", "बैठक", "में", "रिपोर्ट", "जारी"]
+
+
+def fixture_corpus(n_articles, seed=11):
+    rng = random.Random(seed)
+    charged = [w for w in EMOLEX if w.isascii()][:1500] + [w for w in BWS_LEXICON if w.isascii()][:1500]
+    charged_hi = [w for w in EMOLEX if not w.isascii()][:1500] or FILLER_HI
+    corpus = []
+    for n in range(n_articles):
+        hindi = n % 4 == 3
+        filler, loaded, stop = (FILLER_HI, charged_hi, "।") if hindi else (FILLER_EN, charged, ".")
+        sentences = []
+        for _ in range(rng.randint(10, 120)):
+            words = [rng.choice(filler) for _ in range(rng.randint(8, 30))]
+            if rng.random() < 0.3:
+                for _ in range(rng.randint(2, 5)):
+                    words[rng.randrange(len(words))] = rng.choice(loaded)
+            sentences.append(" ".join(words) + stop)
+        corpus.append(" ".join(sentences))
+    return corpus
+
+
+def lexicon_hits(text):
+    return float(aa.LEXICAL.salience([text])[0]) * max(len(aa.WORD_PATTERN.findall(text)), 1) ** 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=aa.PROMPT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    corpus = fixture_corpus(args.articles)
+    totals = {"legacy": [0, 0.0, 0.0], "compressed": [0, 0.0, 0.0]}   # tokens, signal share, seconds
+    for text in corpus:
+        full_hits = lexicon_hits(text) or 1.0
+
+        start = time.perf_counter()
+        legacy = text[:LEGACY_PROMPT_CHARS]
+        legacy_prompt = aa.PROMPT_INSTRUCTIONS + legacy
+        totals["legacy"][2] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        excerpt = aa.compress_article(text, args.budget)
+        prompt = aa.build_prompt(excerpt)
+        totals["compressed"][2] += time.perf_counter() - start
+
+        totals["legacy"][0] += aa.count_tokens(legacy_prompt)
+        totals["legacy"][1] += lexicon_hits(legacy) / full_hits
+        totals["compressed"][0] += aa.count_tokens(prompt)
+        totals["compressed"][1] += lexicon_hits(excerpt) / full_hits
+
+    n = len(corpus)
+    print(f"{n} articles, article budget {args.budget} tokens, instructions {aa.PROMPT_INSTRUCTION_TOKENS} tokens")
+    for name, (tokens, signal, seconds) in totals.items():
+        print(f"{name:<11} {tokens / n:7.0f} prompt tokens/call  "
+              f"{signal / n:6.1%} of lexicon signal  {seconds / n * 1000:6.2f} ms/article")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Reviewer bot under concurrent review sessions, against a local PostgREST stand-in.
+
+Serves the Flask app from a threaded WSGI server in this process and has
+`--reviewers` simulated reviewers each complete `--reviews` full /chat flows.
+Each flow asks for one extra page of the article. Reports p50/p95 latency
+for the ID message (validation + assignment + first page), the rating and
+"more" messages and the final save message, the size of the ID reply,
+review throughput and the
+number of Supabase requests, and checks the stored ratings for reviewers
+rating the same article twice and articles rated past the target.
+`--mode legacy` restores the uncached validation, first-active-article
+assignment and synchronous insert for comparison. Run from the repository root:
+
+    python -m benchmarks.reviewer_load [--reviewers 32] [--reviews 5] [--latency 0.03] [--sessions memory] [--mode both]
+"""
+import argparse
+import importlib
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.stubs import stub_postgrest
+
+ANSWERS = ["3", "4", "2", "3", "4", "anger, fear", "The minister warned of unrest."]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+class FirstActiveArticle:
+    """The bot's original assignment: the first active review_articles row, every time."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def lease(self, reviewer_id):
+        res = self.bot.supabase.table("review_articles") \
+            .select("article_id, articles(id, headline, content)") \
+            .eq("active", True) \
+            .limit(1) \
+            .execute()
+        return res.data[0]["articles"] if res.data else None
+
+    def complete(self, reviewer_id, article_id):
+        pass
+
+
+def rating_quality(reviews, target):
+    pairs = Counter((row["reviewer_id"], row["article_id"]) for row in reviews)
+    per_article = Counter(row["article_id"] for row in reviews)
+    duplicates = sum(n - 1 for n in pairs.values())
+    over_target = sum(max(0, n - target) for n in per_article.values())
+    return duplicates, over_target, len(per_article)
+
+
+def live_blog(n, updates=60):
+    return "\n\n".join(
+        f"Update {u}: the minister said the government would respond to the crisis in district {n}, "
+        f"while the opposition warned of unrest and officials urged calm across the region."
+        for u in range(updates)
+    )
+
+
+def review_session(base_url, reviewer, reviews, timings, sizes):
+    http = requests.Session()
+    user = f"chat-{reviewer}"
+    flow = [("id", reviewer), ("more", "more")] + [("rating", a) for a in ANSWERS[:-1]] + [("save", ANSWERS[-1])]
+    for _ in range(reviews):
+        for stage, message in flow:
+            start = time.perf_counter()
+            response = http.post(f"{base_url}/chat", json={"user_id": user, "message": message})
+            response.raise_for_status()
+            timings[stage].append(time.perf_counter() - start)
+            if stage == "id":
+                sizes.append(len(response.content))
+
+
+def run(bot, server, reviewers, reviews):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    httpd = make_server("127.0.0.1", 0, bot.app, threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{httpd.server_port}"
+
+    bot.sessions.clear()
+    bot.REVIEWER_CACHE.clear()
+    server.reviews.clear()
+    server.active = dict.fromkeys(server.active, True)
+    before_requests = server.requests
+    timings = {"id": [], "more": [], "rating": [], "save": []}
+    sizes = []
+
+    start = time.perf_counter()
+    sessions = [
+        threading.Thread(target=review_session, args=(base_url, f"r{n}", reviews, timings, sizes))
+        for n in range(reviewers)
+    ]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - start
+    bot.REVIEW_WRITER.flush()
+
+    httpd.shutdown()
+    return timings, sizes, elapsed, server.requests - before_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviewers", type=int, default=32)
+    parser.add_argument("--reviews", type=int, default=5, help="review flows per reviewer")
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.03, help="stub round trip in seconds")
+    parser.add_argument("--sessions", choices=["memory", "sqlite"], default="memory", help="session store backend")
+    parser.add_argument("--mode", choices=["pooled", "legacy", "both"], default="both")
+    args = parser.parse_args()
+
+    articles = [{"id": n, "headline": f"Story {n}", "content": live_blog(n)} for n in range(args.articles)]
+    reviewer_ids = [f"r{n}" for n in range(args.reviewers)]
+
+    with stub_postgrest(reviewer_ids, articles, args.latency) as server:
+        # The bot builds its client at import, so point it at the stub first.
+        os.environ["SUPABASE_URL"] = server.url
+        os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "benchmark"
+        os.environ["REVIEW_SPOOL_FILE"] = os.path.join(tempfile.gettempdir(), "reviewer_load_spool.jsonl")
+        os.environ["SESSION_STORE"] = args.sessions
+        os.environ["SESSION_DB_FILE"] = os.path.join(tempfile.gettempdir(), "reviewer_load_sessions.sqlite3")
+        bot = importlib.import_module("reviewer_bot_supabase")
+
+        pooled = (bot.validate_reviewer, bot.save_review, bot.ArticleQueue)
+        legacy = (bot.fetch_reviewer_active, lambda data: bot.insert_reviews([data]), lambda: FirstActiveArticle(bot))
+        modes = ["legacy", "pooled"] if args.mode == "both" else [args.mode]
+
+        total = args.reviewers * args.reviews
+        print(f"{args.reviewers} reviewers x {args.reviews} reviews, stub latency {args.latency * 1000:.0f} ms")
+        for mode in modes:
+            bot.validate_reviewer, bot.save_review, make_queue = legacy if mode == "legacy" else pooled
+            bot.ARTICLE_QUEUE = make_queue()
+            timings, sizes, elapsed, requests_made = run(bot, server, args.reviewers, args.reviews)
+            duplicates, over_target, rated = rating_quality(server.reviews, bot.REVIEW_TARGET_RATINGS)
+            stages = "  ".join(
+                f"{stage} p50 {statistics.median(v) * 1000:5.1f} / p95 {percentile(v, 0.95) * 1000:5.1f} ms"
+                for stage, v in timings.items()
+            )
+            print(f"{mode:<7} {total / elapsed:6.1f} reviews/s  {requests_made:5d} Supabase requests  "
+                  f"{len(server.reviews)} stored over {rated} articles, {duplicates} repeat ratings, "
+                  f"{over_target} past target, ID reply {statistics.mean(sizes) / 1024:.1f} kB\n        {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Reviewer bot session stores: size per session, get+put throughput, eviction
+and sharing between worker processes.
+
+Compares the old session shape (full article dict) with the ID-only one,
+times a chat turn's get+put for the memory and SQLite backends, checks that
+LRU and TTL eviction keep the store bounded, and has several processes
+advance the same reviewers' sessions through one SQLite file. Run from the
+repository root:
+
+    python -m benchmarks.session_store [--sessions 20000] [--content-kb 40] [--workers 4]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+
+import reviewer_bot_supabase as bot
+
+RESPONSES = {"political": 3, "intensity": 4, "sensational": 2, "threat": 3, "group_conflict": 4}
+
+
+def session(n, article=None):
+    s = {"stage": "ask_group", "reviewer_id": f"r{n}", "responses": dict(RESPONSES)}
+    if article is not None:
+        s["article"] = article
+    else:
+        s["article_id"] = n
+    return s
+
+
+def turns(store, n_sessions, rounds=3):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for n in range(n_sessions):
+            s = store.get(f"chat-{n}") or session(n)
+            s["responses"]["threat"] = n % 5
+            store.put(f"chat-{n}", s)
+    return n_sessions * rounds / (time.perf_counter() - start)
+
+
+def advance_shared(path, worker, users):
+    """One worker process's turn: append its number to every user's shared session."""
+    store = bot.SQLiteSessionStore(path)
+    for n in range(users):
+        s = store.get(f"chat-{n}") or {"stage": "ask_id", "turns": []}
+        s["turns"].append(worker)
+        store.put(f"chat-{n}", s)
+    return store.metrics()["sessions"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--content-kb", type=int, default=40, help="article body size in the old session shape")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    article = {"id": 1, "headline": "Publisher story", "content": "x" * (args.content_kb * 1024)}
+    legacy, slim = len(json.dumps(session(1, article))), len(json.dumps(session(1)))
+    print(f"bytes/session: with article {legacy:,}  ID only {slim:,}  "
+          f"({args.sessions} sessions: {legacy * args.sessions / 2**20:,.0f} MB vs {slim * args.sessions / 2**20:,.1f} MB)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "memory": bot.MemorySessionStore(max_entries=args.sessions),
+            "sqlite": bot.SQLiteSessionStore(os.path.join(tmp, "s.sqlite3"), max_entries=args.sessions),
+        }
+        for name, store in stores.items():
+            rate = turns(store, args.sessions)
+            print(f"{name:<7} {rate:10,.0f} get+put/s  {store.metrics()}")
+
+        bound = args.sessions // 10
+        for name, store in {
+            "memory": bot.MemorySessionStore(ttl=0.2, max_entries=bound),
+            "sqlite": bot.SQLiteSessionStore(os.path.join(tmp, "e.sqlite3"), ttl=0.2, max_entries=bound, purge_every=64),
+        }.items():
+            for n in range(bound * 2):
+                store.put(f"chat-{n}", session(n))
+            full = store.metrics()
+            time.sleep(0.3)
+            expired = sum(store.get(f"chat-{n}") is None for n in range(bound * 2))
+            print(f"{name:<7} bound {bound}: {full['sessions']} kept after {bound * 2} puts "
+                  f"(evicted {full['evicted']}), {expired} gone after TTL")
+
+        shared = os.path.join(tmp, "shared.sqlite3")
+        users = 500
+        # A reviewer's messages arrive one after another, each possibly at a
+        # different worker: round w is served entirely by process w.
+        pools = [ProcessPoolExecutor(1) for _ in range(args.workers)]
+        for worker, pool in enumerate(pools):
+            pool.submit(advance_shared, shared, worker, users).result()
+        for pool in pools:
+            pool.shutdown()
+        store = bot.SQLiteSessionStore(shared)
+        complete = sum(sorted(store.get(f"chat-{n}")["turns"]) == list(range(args.workers)) for n in range(users))
+        print(f"shared  {args.workers} processes x {users} sessions: {complete}/{users} saw every worker's turn")
+
+
+if __name__ == "__main__":
+    main()
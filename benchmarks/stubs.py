@@ -0,0 +1,442 @@
+"""Local stand-in HTTP servers used by the benchmarks."""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_ANALYSIS = {
+    "framing_direction": 0.1,
+    "language_intensity": 0.4,
+    "sensationalism_score": 0.3,
+    "topic": "Politics",
+    "bias_explanation": {
+        "framing_reason": "stub",
+        "intensity_reason": "stub",
+        "sensationalism_reason": "stub",
+        "overall_interpretation": "stub",
+    },
+    "behavioural_analysis": {
+        "attention_and_salience": "stub",
+        "emotional_triggers": "stub",
+        "social_and_identity_cues": "stub",
+        "motivation_and_action_signals": "stub",
+        "overall_behavioural_interpretation": "stub",
+    },
+}
+
+
+class StubServer:
+    """Runs a ThreadingHTTPServer on a free localhost port in a background thread."""
+
+    def __init__(self, handler):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+            return self.requests
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def stub_openai(latency=0.2, rate_limit_every=0, responses=None):
+    """
+    OpenAI-compatible /v1/chat/completions stand-in. Each call sleeps for
+    `latency` seconds; every `rate_limit_every`-th call returns a 429.
+    Answers with STUB_ANALYSIS, or with one of the recorded `responses`
+    picked by a hash of the prompt so the same article gets the same answer.
+    """
+    import zlib
+
+    class Handler(_QuietHandler):
+        def do_POST(self):
+            body = self.read_json()
+            analysis = STUB_ANALYSIS
+            if responses:
+                prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+                analysis = responses[zlib.crc32(prompt.encode()) % len(responses)]
+            n = self.server.stub.count_request()
+            if rate_limit_every and n % rate_limit_every == 0:
+                self.send_json(429, {"error": {"message": "rate limited", "type": "requests"}},
+                               {"retry-after": "0.05"})
+                return
+            time.sleep(latency)
+            self.send_json(200, {
+                "id": f"chatcmpl-{n}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o-mini",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": json.dumps(analysis)},
+                }],
+                "usage": {"prompt_tokens": 1000, "completion_tokens": 300, "total_tokens": 1300},
+            })
+
+    return StubServer(Handler)
+
+
+def stub_airtable(records=(), page_size=100, rate_limit_every=0, latency=0.0, retry_after="0.05"):
+    """
+    Airtable REST stand-in for a single table: paginated list (with the
+    analyzer's and scraper's filter formulas and fields[] projection), batch create
+    (POST) and batch update (PATCH). Every `rate_limit_every`-th request gets
+    a 429 carrying `retry_after` (None sends no Retry-After, as Airtable
+    itself does); every request waits `latency` seconds. Records live in
+    `server.records` keyed by ID.
+    """
+
+    class Handler(_QuietHandler):
+        def limited(self):
+            n = self.server.stub.count_request()
+            time.sleep(latency)
+            if rate_limit_every and n % rate_limit_every == 0:
+                headers = {"Retry-After": retry_after} if retry_after is not None else {}
+                self.send_json(429, {"errors": [{"error": "RATE_LIMIT_REACHED"}]}, headers)
+                return True
+            return False
+
+        def do_GET(self):
+            if self.limited():
+                return
+            from urllib.parse import parse_qs, urlparse
+            query = parse_qs(urlparse(self.path).query)
+            stub = self.server.stub
+            ordered = list(stub.records.values())
+            # Only the formulas the scraper and analyzer send are understood.
+            formula = query.get("filterByFormula", [""])[0]
+            if formula == "NOT({Processed})":
+                ordered = [r for r in ordered if not r["fields"].get("Processed")]
+            elif formula == "{Processed}":
+                ordered = [r for r in ordered if r["fields"].get("Processed")]
+            elif formula.startswith("OR(RECORD_ID() = '"):
+                wanted = set(re.findall(r"RECORD_ID\(\) = '([^']+)'", formula))
+                ordered = [r for r in ordered if r["id"] in wanted]
+            elif formula.startswith("{URL} = '"):
+                url = formula[len("{URL} = '"):-1].replace("\\'", "'").replace("\\\\", "\\")
+                ordered = [r for r in ordered if r["fields"].get("URL") == url]
+            if "fields[]" in query:
+                ordered = [
+                    {"id": r["id"], "fields": {k: v for k, v in r["fields"].items() if k in query["fields[]"]}}
+                    for r in ordered
+                ]
+            start = int(query.get("offset", ["0"])[0])
+            page = ordered[start:start + page_size]
+            payload = {"records": page}
+            if start + page_size < len(ordered):
+                payload["offset"] = str(start + page_size)
+            self.send_json(200, payload)
+
+        def do_POST(self):
+            body = self.read_json()
+            if self.limited():
+                return
+            stub = self.server.stub
+            records = body.get("records") or [body]
+            created = []
+            with stub.lock:
+                for record in records:
+                    record_id = f"rec{len(stub.records):08d}"
+                    stub.records[record_id] = {"id": record_id, "fields": dict(record["fields"])}
+                    created.append(stub.records[record_id])
+            stub.batches.append(("POST", len(records)))
+            self.send_json(200, {"records": created} if "records" in body else created[0])
+
+        def do_PATCH(self):
+            body = self.read_json()
+            if self.limited():
+                return
+            stub = self.server.stub
+            with stub.lock:
+                for record in body["records"]:
+                    stub.records[record["id"]]["fields"].update(record["fields"])
+            stub.batches.append(("PATCH", len(body["records"])))
+            self.send_json(200, {"records": [stub.records[r["id"]] for r in body["records"]]})
+
+    server = StubServer(Handler)
+    server.records = {r["id"]: json.loads(json.dumps(r)) for r in records}
+    server.batches = []
+    return server
+
+
+class StubCluster:
+    """Several StubServers started and stopped together, e.g. one per publisher host."""
+
+    def __init__(self, servers):
+        self.servers = servers
+
+    @property
+    def requests(self):
+        return sum(server.requests for server in self.servers)
+
+    def __enter__(self):
+        for server in self.servers:
+            server.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        for server in self.servers:
+            server.__exit__(*exc)
+
+
+def stub_news_site(publishers=12, articles_per_feed=5, paragraphs=12, latency=0.05):
+    """
+    One server (so one host:port) per publisher, each serving an RSS feed at
+    /feed/<p>.xml that links to article pages at /article/<p>/<n>.html. Items
+    are dated "now" so they pass the scraper's recency window. Every response
+    waits `latency` seconds.
+    """
+    from email.utils import formatdate
+
+    class Handler(_QuietHandler):
+        def send_body(self, body, content_type):
+            body = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self.server.stub.count_request()
+            time.sleep(latency)
+            base = self.server.stub.url
+            parts = self.path.strip("/").split("/")
+
+            if parts[0] == "feed":
+                p = parts[1].split(".")[0]
+                items = "".join(
+                    f"<item><title>Publisher {p} story {n}</title>"
+                    f"<link>{base}/article/{p}/{n}.html</link>"
+                    f"<pubDate>{formatdate(time.time() - n * 60, usegmt=True)}</pubDate></item>"
+                    for n in range(articles_per_feed)
+                )
+                self.send_body(
+                    f'<?xml version="1.0"?><rss version="2.0"><channel><title>{p}</title>{items}</channel></rss>',
+                    "application/rss+xml",
+                )
+            elif parts[0] == "article":
+                p, n = parts[1], parts[2].split(".")[0]
+                body = "".join(
+                    f"<p>Paragraph {i} of story {n} from publisher {p}. The minister said the "
+                    f"government would respond to the crisis with new measures, while the "
+                    f"opposition warned of risk and uncertainty across the region.</p>"
+                    for i in range(paragraphs)
+                )
+                self.send_body(
+                    f"<html><head><title>Story {n}</title></head><body><article>"
+                    f"<h1>Publisher {p} story {n}</h1>{body}</article></body></html>",
+                    "text/html",
+                )
+            else:
+                self.send_json(404, {})
+
+    cluster = StubCluster([StubServer(Handler) for _ in range(publishers)])
+    cluster.feeds = lambda: {
+        f"Publisher {p}": f"{server.url}/feed/{p}.xml" for p, server in enumerate(cluster.servers)
+    }
+    return cluster
+
+
+def stub_pages(pages):
+    """Serves fixed responses: `pages` maps a path to (Content-Type, body bytes)."""
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            self.server.stub.count_request()
+            if self.path not in pages:
+                self.send_json(404, {})
+                return
+            content_type, body = pages[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StubServer(Handler)
+
+
+def stub_recorded_site(publishers, latency=0.05):
+    """
+    Replays recorded publishers, one server (so one host:port) each. Every
+    publisher is a dict with the feed XML under "feed" and article HTML under
+    "pages"; the feed is served at /feed.xml and page n at /page/<n>.html.
+    In the feed, "__BASE__" becomes the server's URL and "__AGE_<s>__" an
+    RFC 822 date <s> seconds ago, so items always fall in the scraper's
+    recency window. Every response waits `latency` seconds.
+    """
+    from email.utils import formatdate
+
+    age = re.compile(r"__AGE_(\d+)__")
+
+    class Handler(_QuietHandler):
+        def send_body(self, body, content_type):
+            body = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            stub = self.server.stub
+            stub.count_request()
+            time.sleep(latency)
+            if self.path == "/feed.xml":
+                now = time.time()
+                feed = age.sub(lambda m: formatdate(now - int(m.group(1)), usegmt=True), stub.publisher["feed"])
+                self.send_body(feed.replace("__BASE__", stub.url), "application/rss+xml")
+                return
+            match = re.fullmatch(r"/page/(\d+)\.html", self.path)
+            if match and int(match.group(1)) < len(stub.publisher["pages"]):
+                self.send_body(stub.publisher["pages"][int(match.group(1))], "text/html; charset=utf-8")
+            else:
+                self.send_json(404, {})
+
+    servers = []
+    for publisher in publishers:
+        server = StubServer(Handler)
+        server.publisher = publisher
+        servers.append(server)
+    cluster = StubCluster(servers)
+    cluster.feeds = lambda: {
+        publisher["name"]: f"{server.url}/feed.xml" for publisher, server in zip(publishers, cluster.servers)
+    }
+    return cluster
+
+
+def stub_postgrest(reviewers=(), articles=(), latency=0.02):
+    """
+    Supabase/PostgREST stand-in serving /rest/v1 for the reviewer bot's
+    tables: `reviewers`, `articles`, `review_articles` (with the embedded
+    article, and PATCH to deactivate) and `human_reviews` (select and insert). Understands
+    the eq, in and not.in filters and limit. Every request waits `latency`
+    seconds. Inserted rows collect in `server.reviews` and insert request
+    sizes in `server.inserts`; `server.active` maps article ID to its flag.
+    """
+    from urllib.parse import parse_qs, urlparse
+
+    def matches(row, column, condition):
+        negate = condition.startswith("not.")
+        op, _, value = condition[4 if negate else 0:].partition(".")
+        field = str(row.get(column)).lower()
+        if op == "eq":
+            hit = field == value.lower()
+        elif op == "in":
+            hit = field in value.strip("()").lower().split(",")
+        else:
+            return True
+        return hit != negate
+
+    class Handler(_QuietHandler):
+        def query(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            return url.path.rsplit("/", 1)[-1], params
+
+        def table_rows(self, table):
+            stub = self.server.stub
+            if table == "reviewers":
+                return [{"id": rid, "active": True} for rid in stub.reviewers]
+            if table == "review_articles":
+                return [{"article_id": a["id"], "active": stub.active[a["id"]], "articles": a} for a in stub.articles]
+            if table == "human_reviews":
+                return list(stub.reviews)
+            if table == "articles":
+                return list(stub.articles)
+            return None
+
+        def filtered(self, rows, params):
+            for column, condition in params.items():
+                if column not in ("select", "order", "limit", "offset"):
+                    rows = [row for row in rows if matches(row, column, condition)]
+            return rows
+
+        def do_GET(self):
+            self.server.stub.count_request()
+            time.sleep(latency)
+            table, params = self.query()
+            with self.server.stub.lock:
+                rows = self.table_rows(table)
+            if rows is None:
+                self.send_json(404, {"message": f"relation {table} does not exist"})
+                return
+            rows = self.filtered(rows, params)
+            if "limit" in params:
+                rows = rows[:int(params["limit"])]
+            self.send_json(200, rows)
+
+        def do_POST(self):
+            body = self.read_json()
+            self.server.stub.count_request()
+            time.sleep(latency)
+            rows = body if isinstance(body, list) else [body]
+            stub = self.server.stub
+            with stub.lock:
+                stub.reviews.extend(rows)
+                stub.inserts.append(len(rows))
+            self.send_json(201, rows)
+
+        def do_PATCH(self):
+            body = self.read_json()
+            self.server.stub.count_request()
+            time.sleep(latency)
+            table, params = self.query()
+            stub = self.server.stub
+            with stub.lock:
+                rows = self.filtered(self.table_rows(table) or [], params)
+                if table == "review_articles" and "active" in body:
+                    for row in rows:
+                        stub.active[row["article_id"]] = body["active"]
+            self.send_json(200, rows)
+
+    server = StubServer(Handler)
+    server.reviewers = set(reviewers)
+    server.articles = list(articles)
+    server.active = {a["id"]: True for a in server.articles}
+    server.reviews = []
+    server.inserts = []
+    return server
@@ -0,0 +1,173 @@
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+# ---------------- SETUP ----------------
+
+# Metrics are off unless METRICS=1 or an export path is set. When off, span()
+# hands back a shared no-op, count() returns at once and timed() leaves the
+# function undecorated, so instrumented code runs as if it weren't. Spans and
+# counts made with always=True are recorded either way, for the timings a
+# command prints in its own end-of-run report.
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE")            # Prometheus node_exporter textfile
+METRICS_SUMMARY_FILE = os.getenv("METRICS_SUMMARY_FILE")    # JSON run summary
+METRICS_ENABLED = os.getenv("METRICS", "0") != "0" or bool(METRICS_TEXTFILE or METRICS_SUMMARY_FILE)
+METRICS_PREFIX = os.getenv("METRICS_PREFIX", "newsbias")
+
+# Histogram bucket upper bounds in seconds, from local scoring to slow LLM calls.
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# ---------------- METRICS ----------------
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    """
+    Timing spans and event counters for one run, shared by every thread.
+    Span names are dotted ("airtable.post", "analyzer.llm"); each keeps a call
+    count, total and max seconds and a SPAN_BUCKETS histogram. Counters are
+    plain totals ("llm.retry", "analysis_cache.hit"). export() writes the
+    Prometheus textfile and/or JSON summary.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.spans = {}       # name -> [count, total, max, bucket counts]
+        self.counters = {}
+        self.started = time.time()
+
+    def span(self, name, always=False):
+        """Context manager timing the block under `name`."""
+        if not (self.enabled or always):
+            return NO_SPAN
+        return _Span(self, name)
+
+    def timed(self, name):
+        """Decorator timing every call under `name`; a no-op while disabled."""
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _Span(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds):
+        with self.lock:
+            entry = self.spans.get(name)
+            if entry is None:
+                entry = self.spans[name] = [0, 0.0, 0.0, [0] * len(SPAN_BUCKETS)]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            for i, bound in enumerate(SPAN_BUCKETS):
+                if seconds <= bound:
+                    entry[3][i] += 1
+                    break
+
+    def count(self, name, n=1, always=False):
+        if not (self.enabled or always):
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        with self.lock:
+            spans = {
+                name: {"calls": calls, "seconds": round(total, 6), "max_seconds": round(peak, 6),
+                       "mean_ms": round(total / calls * 1000, 3)}
+                for name, (calls, total, peak, _) in sorted(self.spans.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "duration_seconds": round(time.time() - self.started, 3),
+            "spans": spans,
+            "counters": counters,
+        }
+
+    def prometheus(self):
+        """Prometheus text exposition: one histogram family for spans, one counter family for events."""
+        p = METRICS_PREFIX
+        lines = [
+            f"# HELP {p}_span_seconds Time spent in instrumented calls.",
+            f"# TYPE {p}_span_seconds histogram",
+        ]
+        with self.lock:
+            for name, (calls, total, _, buckets) in sorted(self.spans.items()):
+                cumulative = 0
+                for bound, hits in zip(SPAN_BUCKETS, buckets):
+                    cumulative += hits
+                    lines.append(f'{p}_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_span_seconds_bucket{{span="{name}",le="+Inf"}} {calls}')
+                lines.append(f'{p}_span_seconds_sum{{span="{name}"}} {total:.6f}')
+                lines.append(f'{p}_span_seconds_count{{span="{name}"}} {calls}')
+            lines += [f"# HELP {p}_events_total Counted events.", f"# TYPE {p}_events_total counter"]
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'{p}_events_total{{event="{name}"}} {value}')
+        lines += [
+            f"# HELP {p}_run_last_timestamp_seconds When the last instrumented run finished.",
+            f"# TYPE {p}_run_last_timestamp_seconds gauge",
+            f"{p}_run_last_timestamp_seconds {time.time():.0f}",
+            f"# HELP {p}_run_duration_seconds Wall time of the last instrumented run.",
+            f"# TYPE {p}_run_duration_seconds gauge",
+            f"{p}_run_duration_seconds {time.time() - self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, textfile=METRICS_TEXTFILE, summary_file=METRICS_SUMMARY_FILE):
+        """Write whichever outputs are configured. Files are replaced atomically."""
+        if not self.enabled:
+            return
+        if textfile:
+            _write_atomic(textfile, self.prometheus())
+        if summary_file:
+            _write_atomic(summary_file, json.dumps(self.summary(), indent=2) + "\n")
+
+
+def _write_atomic(path, text):
+    # node_exporter may read the textfile at any moment, so never expose a partial one.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, staging = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.chmod(staging, 0o644)
+    os.replace(staging, path)
+
+
+METRICS = Metrics()
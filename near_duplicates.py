@@ -0,0 +1,182 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+
+import numpy as np
+
+# ---------------- MINHASH / LSH PARAMETERS ----------------
+
+SHINGLE_SIZE = 5            # words per shingle
+NUM_PERM = 128
+LSH_BANDS = 32              # 32 bands x 4 rows: candidates from roughly 0.4 Jaccard upwards
+LSH_ROWS = NUM_PERM // LSH_BANDS
+MATCH_THRESHOLD = 0.6       # estimated Jaccard needed to join an existing cluster
+STORY_WINDOW_DAYS = 7       # documents older than this drop out of the index
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Universal hash family h(x) = (a*x + b) mod p over 32-bit shingle hashes. With
+# a < 2**31 and x < 2**32 the product fits in uint64 without overflow.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 31, NUM_PERM, dtype=np.uint64)
+
+# ---------------- URL CANONICALIZATION ----------------
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "yclid", "twclid", "_gl",
+    "mc_cid", "mc_eid", "ref", "ref_src", "ref_url", "cmpid", "ncid", "ito", "from",
+}
+AMP_PARAMS = {"amp", "amp_js_v", "usqp", "outputtype"}
+AMP_PATH_RULES = [
+    (re.compile(r"/amp(?:/\d+)?/?$"), ""),                  # .../story/amp, .../story/amp/1
+    (re.compile(r"^/amp/"), "/"),                            # /amp/section/story
+    (re.compile(r"/amp_(articleshow|videoshow)/"), r"/\1/"),  # TOI-style AMP pages
+    (re.compile(r"[._]amp(\.html?)$"), r"\1"),               # story_amp.html, story.amp.html
+    (re.compile(r"\.amp$"), ""),
+]
+
+
+def canonicalize_url(url):
+    """
+    Normalize a URL so that tracking-tagged, AMP and www variants of the same
+    story compare equal: https scheme, lowercase host without www./amp.,
+    no fragment, no tracking or AMP query params, no trailing slash.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+
+    path = parts.path or "/"
+    for pattern, replacement in AMP_PATH_RULES:
+        path = pattern.sub(replacement, path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_")
+        and k.lower() not in TRACKING_PARAMS
+        and k.lower() not in AMP_PARAMS
+    )
+    return urllib.parse.urlunsplit(("https", host, path or "/", urllib.parse.urlencode(query), ""))
+
+# ---------------- SIGNATURES ----------------
+
+def shingle_hashes(text):
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signature(text):
+    hashes = shingle_hashes(text)
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+def band_buckets(signature):
+    """One stable 63-bit bucket key per LSH band."""
+    rows = signature.reshape(LSH_BANDS, LSH_ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little") >> 1
+        for row in rows
+    ]
+
+def estimated_jaccard(a, b):
+    return float(np.mean(a == b))
+
+# ---------------- INDEX ----------------
+
+class StoryIndex:
+    """
+    Persistent MinHash/LSH index over a rolling window of articles. Each
+    document is keyed (normally by canonical URL) and belongs to a story
+    cluster; near-duplicates of an indexed document join its cluster.
+    Lookups touch one SQLite index entry per LSH band.
+    """
+
+    def __init__(self, path, window_days=STORY_WINDOW_DAYS):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                cluster TEXT NOT NULL,
+                added REAL NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                doc INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS buckets_doc ON buckets (doc);
+            CREATE INDEX IF NOT EXISTS docs_added ON docs (added);
+        """)
+        self.prune(window_days)
+
+    def prune(self, window_days):
+        cutoff = time.time() - window_days * 86400
+        with self.lock:
+            self.db.execute("DELETE FROM buckets WHERE doc IN (SELECT id FROM docs WHERE added < ?)", (cutoff,))
+            self.db.execute("DELETE FROM docs WHERE added < ?", (cutoff,))
+            self.db.commit()
+
+    def _best_match(self, signature, buckets):
+        candidates = set()
+        for band, bucket in enumerate(buckets):
+            rows = self.db.execute(
+                "SELECT doc FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ).fetchall()
+            candidates.update(doc for (doc,) in rows)
+
+        best_cluster, best_score = None, MATCH_THRESHOLD
+        for doc in candidates:
+            cluster, blob = self.db.execute("SELECT cluster, signature FROM docs WHERE id = ?", (doc,)).fetchone()
+            score = estimated_jaccard(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= best_score:
+                best_cluster, best_score = cluster, score
+        return best_cluster
+
+    def assign(self, key, text):
+        """Return the cluster ID for `key`, indexing `text` if the key is new."""
+        with self.lock:
+            row = self.db.execute("SELECT cluster FROM docs WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+
+        signature = minhash_signature(text)
+        buckets = band_buckets(signature)
+
+        with self.lock:
+            row = self.db.execute("SELECT cluster FROM docs WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+            # A new story's cluster is named after its first document's key,
+            # so cluster names stay unique even if the index is rebuilt.
+            cluster = self._best_match(signature, buckets) or key
+            cursor = self.db.execute(
+                "INSERT INTO docs (key, cluster, added, signature) VALUES (?, ?, ?, ?)",
+                (key, cluster, time.time(), signature.tobytes())
+            )
+            doc = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO buckets (band, bucket, doc) VALUES (?, ?, ?)",
+                [(band, bucket, doc) for band, bucket in enumerate(buckets)]
+            )
+            self.db.commit()
+            return cluster
+
+    def cluster_size(self, cluster):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM docs WHERE cluster = ?", (cluster,)).fetchone()[0]
@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import analyze_articles as analyzer
+import news_scraper as scraper
+from article_store import AIRTABLE_SYNC
+from instrumentation import METRICS
+from near_duplicates import canonicalize_url
+
+# ---------------- SETUP ----------------
+
+PIPELINE_JOURNAL_FILE = os.getenv("PIPELINE_JOURNAL_FILE", "pipeline_journal.sqlite3")
+# Scraped records waiting for analysis; scraping pauses while the queue is full.
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", str(analyzer.LLM_CONCURRENCY * 2)))
+
+NEW = "new"           # scraped this run, created in Airtable with its analysis
+UPDATE = "update"     # already stored but unprocessed, patched with its analysis
+
+# ---------------- JOURNAL ----------------
+
+class PipelineJournal:
+    """
+    Local SQLite checkpoint of every record between scrape and write-back.
+    A record is journaled with its scraped fields before analysis, gains its
+    analysis fields once the LLM has answered, and is removed once it is in
+    the article store and Airtable has accepted it (or it has been handed to
+    the upload spool). Whatever is
+    left after a crash is resumed on the next run without re-downloading the
+    page or re-running the analysis.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, record TEXT NOT NULL, "
+            "fields TEXT, updated REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def contains(self, key):
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM items WHERE key = ?", (key,)).fetchone() is not None
+
+    def scraped(self, key, kind, article):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO items (key, kind, record, updated) VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(article), time.time())
+            )
+            self.db.commit()
+
+    def analyzed(self, key, fields):
+        with self.lock:
+            self.db.execute(
+                "UPDATE items SET fields = ?, updated = ? WHERE key = ?",
+                (json.dumps(fields), time.time(), key)
+            )
+            self.db.commit()
+
+    def done(self, keys):
+        with self.lock:
+            self.db.executemany("DELETE FROM items WHERE key = ?", [(key,) for key in keys])
+            self.db.commit()
+
+    def pending(self):
+        """(key, kind, article, fields) for unfinished items; fields is None if not yet analyzed."""
+        with self.lock:
+            rows = self.db.execute("SELECT key, kind, record, fields FROM items ORDER BY updated").fetchall()
+        return [
+            (key, kind, json.loads(record), json.loads(fields) if fields is not None else None)
+            for key, kind, record, fields in rows
+        ]
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+# ---------------- STAGES ----------------
+
+def produce(journal, work, results, feeds):
+    """
+    Feed the work queue: journaled leftovers from an interrupted run first,
+    then freshly scraped articles, then stored or Airtable records that are
+    still unprocessed.
+    """
+    resumed = 0
+    for key, kind, article, fields in journal.pending():
+        resumed += 1
+        if fields is None:
+            work.put((kind, article))
+        elif kind == NEW and AIRTABLE_SYNC and scraper.URL_INDEX.contains(article["fields"]["URL"]):
+            # The create went through before the crash; the URL sync saw it.
+            analyzer.ARTICLE_STORE.save_analysis(key, fields)
+            journal.done([key])
+        else:
+            results.put((kind, article, fields))
+    if resumed:
+        print(f"Resuming {resumed} journaled records")
+        METRICS.count("pipeline.resumed", resumed)
+
+    for record in scraper.iter_new_records(feeds):
+        record = scraper.sanitize_record(record)
+        article = {"id": None, "key": analyzer.ARTICLE_STORE.add(record), "fields": record}
+        journal.scraped(article["key"], NEW, article)
+        work.put((NEW, article))
+
+    for article in analyzer.iter_pending_articles():
+        if journal.contains(article["key"]):
+            continue
+        journal.scraped(article["key"], UPDATE, article)
+        work.put((UPDATE, article))
+
+def analyze(journal, work, results):
+    """Worker: clean, score and LLM-analyze queued records until a None arrives."""
+    while True:
+        item = work.get()
+        if item is None:
+            results.put(None)
+            return
+        kind, article = item
+        try:
+            # Short articles come back with just "Processed" and no analysis fields.
+            fields = analyzer.score_article(article)
+            journal.analyzed(article["key"], fields)
+        except Exception as e:
+            print(f"Failed: {article['fields'].get('Headline', 'Untitled')}", e)
+            METRICS.count("analyzer.failed")
+            fields = None
+        results.put((kind, article, fields))
+
+def write(journal, patched, kind, article, fields):
+    """
+    Save one analyzed record to the article store and queue its Airtable
+    write. Runs on the main thread only; `patched` maps Airtable IDs of
+    queued updates back to their journal keys.
+    """
+    key = article["key"]
+    if fields:
+        analyzer.ARTICLE_STORE.save_analysis(key, fields)
+        print(f"Processed: {article['fields'].get('Headline', 'Untitled')}")
+
+    if not AIRTABLE_SYNC:
+        journal.done([key])
+    elif kind == NEW:
+        # A failed analysis still stores the article; the next run's
+        # unprocessed-record pass picks it up again.
+        scraper.UPLOADER.add({"fields": {**article["fields"], **(fields or {})}})
+    elif fields and article["id"]:
+        patched[article["id"]] = key
+        analyzer.update_record(article["id"], fields)
+    else:
+        journal.done([key])
+
+# ---------------- MAIN ----------------
+
+def main(feeds=scraper.RSS_FEEDS, concurrency=analyzer.LLM_CONCURRENCY):
+    started = time.perf_counter()
+    concurrency = max(1, concurrency)
+    analyzer.warm_up()
+    journal = PipelineJournal(PIPELINE_JOURNAL_FILE)
+
+    # The scraper shares the analyzer's article store and story index.
+    scraper.ARTICLE_STORE = analyzer.ARTICLE_STORE
+    scraper.STORY_INDEX = analyzer.STORY_INDEX
+    scraper.prepare_indexes()
+
+    patched = {}
+
+    def created(batch, stored):
+        scraper.record_uploaded(batch, stored)
+        if stored is not None:
+            for record in batch:
+                scraper.URL_INDEX.add(record["fields"]["URL"])
+            journal.done([canonicalize_url(record["fields"]["URL"]) for record in batch])
+
+    def updated(batch, stored):
+        if stored is not None:
+            journal.done([patched.pop(record["id"], record["id"]) for record in batch])
+
+    scraper.UPLOADER.on_batch = created
+    analyzer.AIRTABLE_WRITER.on_batch = updated
+
+    # Scraping, analysis and write-back overlap: the producer blocks once
+    # PIPELINE_QUEUE_SIZE records are waiting, workers pull from the queue,
+    # and this thread batches their results to Airtable as they arrive.
+    work = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    results = queue.Queue()
+    workers = [
+        threading.Thread(target=analyze, args=(journal, work, results), daemon=True)
+        for _ in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # An exception in the producer is re-raised below once everything already
+    # analyzed has been written, so a failed scrape still fails the run.
+    producer_error = []
+
+    def run_producer():
+        try:
+            produce(journal, work, results, feeds)
+        except BaseException as e:
+            producer_error.append(e)
+        finally:
+            for _ in workers:
+                work.put(None)
+
+    producer = threading.Thread(target=run_producer, daemon=True)
+    producer.start()
+
+    running = len(workers)
+    while running:
+        item = results.get()
+        if item is None:
+            running -= 1
+        else:
+            write(journal, patched, *item)
+    producer.join()
+
+    # Creates that still fail go to the upload spool, which owns them from here.
+    scraper.UPLOADER.flush()
+    journal.done([canonicalize_url(record["fields"]["URL"]) for record in scraper.UPLOADER.failed])
+    scraper.flush_uploads()
+    analyzer.AIRTABLE_WRITER.flush()
+    analyzer.ARTICLE_STORE.checkpoint()
+
+    print(f"Created {scraper.UPLOADER.written} records, updated {analyzer.AIRTABLE_WRITER.written}")
+    if analyzer.AIRTABLE_WRITER.failed:
+        print(f"Airtable updates failed for {len(analyzer.AIRTABLE_WRITER.failed)} records")
+    print(f"{len(journal)} records left in the journal")
+    print(analyzer.ANALYSIS_CACHE.summary())
+    print(scraper.extractor_report())
+    print(scraper.stage_report())
+    print(f"  {'total':<10}            {time.perf_counter() - started:8.2f} s")
+    METRICS.export()
+
+    if producer_error:
+        raise producer_error[0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scrape, analyze and store articles in one checkpointed pass."
+    )
+    parser.add_argument("--concurrency", type=int, default=analyzer.LLM_CONCURRENCY,
+                        help="number of articles analyzed in parallel (default: %(default)s)")
+    args = parser.parse_args()
+    main(concurrency=args.concurrency)
@@ -1,7 +1,17 @@
 import os
-from flask import Flask, request, jsonify
+import atexit
+import json
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import httpx
+from flask import Flask, Response, request, jsonify, stream_with_context
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase import ClientOptions, create_client
 
 load_dotenv(dotenv_path=".env", override=True)
 
@@ -10,15 +20,209 @@ load_dotenv(dotenv_path=".env", override=True)
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# One client per process, shared by all request threads. Its HTTP pool keeps
+# connections to PostgREST open between requests instead of reconnecting.
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "32"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+
+http_client = httpx.Client(
+    timeout=SUPABASE_TIMEOUT,
+    limits=httpx.Limits(max_connections=SUPABASE_POOL_SIZE, max_keepalive_connections=SUPABASE_POOL_SIZE),
+)
+supabase = create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http_client))
 
 print("Supabase URL:", SUPABASE_URL[:30], "...")
 print("Supabase key loaded:", bool(SUPABASE_KEY))
 
+# Reviewer IDs are re-checked against Supabase at most once per TTL.
+# Unknown IDs are remembered briefly so retries don't hammer the table,
+# but short enough that a newly added reviewer can log in straight away.
+REVIEWER_CACHE_TTL = float(os.getenv("REVIEWER_CACHE_TTL", "300"))
+REVIEWER_MISS_TTL = float(os.getenv("REVIEWER_MISS_TTL", "10"))
+
+# Reviews are inserted from a background thread, up to REVIEW_BATCH_SIZE rows
+# per request, at most REVIEW_FLUSH_INTERVAL seconds after they arrive.
+REVIEW_BATCH_SIZE = int(os.getenv("REVIEW_BATCH_SIZE", "50"))
+REVIEW_FLUSH_INTERVAL = float(os.getenv("REVIEW_FLUSH_INTERVAL", "1.0"))
+REVIEW_MAX_ATTEMPTS = 5
+REVIEW_BACKOFF_BASE = 0.5
+REVIEW_BACKOFF_MAX = 15.0
+REVIEW_SPOOL_FILE = os.getenv("REVIEW_SPOOL_FILE", "review_spool.jsonl")
+
+# Each article is shown to reviewers until it has REVIEW_TARGET_RATINGS
+# ratings. A reviewer holds their article for REVIEW_LEASE_TTL seconds;
+# articles are loaded REVIEW_PREFETCH at a time.
+REVIEW_TARGET_RATINGS = int(os.getenv("REVIEW_TARGET_RATINGS", "3"))
+REVIEW_LEASE_TTL = float(os.getenv("REVIEW_LEASE_TTL", "1800"))
+REVIEW_PREFETCH = int(os.getenv("REVIEW_PREFETCH", "50"))
+
+# Article bodies are fetched once, cleaned and cut into pages of about
+# ARTICLE_PAGE_CHARS; the reviewer sees the first page and asks for more.
+# Up to ARTICLE_CACHE_CHARS of page text is kept per process.
+ARTICLE_PAGE_CHARS = int(os.getenv("ARTICLE_PAGE_CHARS", "1500"))
+ARTICLE_CACHE_CHARS = int(os.getenv("ARTICLE_CACHE_CHARS", str(32 * 1024 * 1024)))
+
+# Chat sessions expire SESSION_TTL seconds after the reviewer's last message.
+# "memory" keeps them in this process; "sqlite" shares them between worker
+# processes on the same host through SESSION_DB_FILE.
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+SESSION_DB_FILE = os.getenv("SESSION_DB_FILE", "sessions.sqlite3")
+
+# ---------------- Session Store ----------------
+
+class MemorySessionStore:
+    """
+    Chat sessions in this process, least recently used first out once there
+    are more than `max_entries`. Sessions are kept as JSON, so get() hands
+    out a copy and changes only stick once put() back.
+    """
+
+    def __init__(self, ttl=SESSION_TTL, max_entries=SESSION_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()    # user -> (json, expiry)
+        self.bytes = 0
+        self.evicted = self.expired = 0
+
+    def get(self, user):
+        with self.lock:
+            entry = self.entries.get(user)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                self._remove(user)
+                self.expired += 1
+                return None
+            self.entries.move_to_end(user)
+            return json.loads(entry[0])
+
+    def put(self, user, session):
+        data = json.dumps(session)
+        with self.lock:
+            if user in self.entries:
+                self._remove(user)
+            self.entries[user] = (data, time.monotonic() + self.ttl)
+            self.bytes += len(data)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+                self.evicted += 1
+
+    def delete(self, user):
+        with self.lock:
+            if user in self.entries:
+                self._remove(user)
+
+    def _remove(self, user):
+        data, _ = self.entries.pop(user)
+        self.bytes -= len(data)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def metrics(self):
+        with self.lock:
+            return {"backend": "memory", "sessions": len(self.entries), "bytes": self.bytes,
+                    "evicted": self.evicted, "expired": self.expired}
+
+
+class SQLiteSessionStore:
+    """
+    Chat sessions in a SQLite file shared by every worker process on the
+    host, so any worker can serve any reviewer's next message. A put()
+    that takes the table past `max_entries` evicts the least recently used
+    session in the same transaction, so the bound holds across processes;
+    expired sessions are purged every `purge_every` writes. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path=SESSION_DB_FILE, ttl=SESSION_TTL, max_entries=SESSION_MAX_ENTRIES, purge_every=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_every = purge_every
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (user TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+        self.db.commit()
+        self.writes = 0
+        self.evicted = self.expired = 0
+
+    def get(self, user):
+        with self.lock:
+            row = self.db.execute("SELECT data, expires FROM sessions WHERE user = ?", (user,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < time.time():
+            self.delete(user)
+            self.expired += 1
+            return None
+        return json.loads(row[0])
+
+    def put(self, user, session):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sessions (user, data, expires) VALUES (?, ?, ?)",
+                (user, json.dumps(session), time.time() + self.ttl)
+            )
+            # The insert holds the write lock until commit, so no other
+            # process can add a session between the count and the eviction.
+            self._evict()
+            self.db.commit()
+            self.writes += 1
+            if self.writes % self.purge_every == 0:
+                self._purge()
+
+    def delete(self, user):
+        with self.lock:
+            self.db.execute("DELETE FROM sessions WHERE user = ?", (user,))
+            self.db.commit()
+
+    def _evict(self):
+        excess = self.db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            # Every message pushes expiry out by the TTL, so the earliest
+            # expiry is the least recently used session.
+            self.evicted += self.db.execute(
+                "DELETE FROM sessions WHERE user IN (SELECT user FROM sessions ORDER BY expires LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+    def _purge(self):
+        self.expired += self.db.execute("DELETE FROM sessions WHERE expires < ?", (time.time(),)).rowcount
+        self.db.commit()
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM sessions")
+            self.db.commit()
+
+    def metrics(self):
+        with self.lock:
+            count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions").fetchone()
+        return {"backend": "sqlite", "sessions": count, "bytes": size,
+                "evicted": self.evicted, "expired": self.expired}
+
+
+def make_session_store(kind=SESSION_STORE):
+    if kind == "sqlite":
+        return SQLiteSessionStore()
+    if kind == "memory":
+        return MemorySessionStore()
+    raise ValueError(f"Unknown SESSION_STORE: {kind}")
+
 # ---------------- App Setup ----------------
 
 app = Flask(__name__, static_folder=".")
-sessions = {}
+sessions = make_session_store()
 
 # ---------------- Serve Frontend ----------------
 
@@ -28,7 +232,42 @@ def home():
 
 # ---------------- Supabase Helpers ----------------
 
-def validate_reviewer(rid):
+class TTLCache:
+    """Thread-safe dict whose entries expire `ttl` seconds after they are set."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            if len(self.entries) >= self.max_entries:
+                now = time.monotonic()
+                self.entries = {k: v for k, v in self.entries.items() if v[1] >= now}
+                if len(self.entries) >= self.max_entries:
+                    self.entries.clear()
+            self.entries[key] = (value, time.monotonic() + ttl)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+REVIEWER_CACHE = TTLCache()
+
+
+def fetch_reviewer_active(rid):
     res = supabase.table("reviewers") \
         .select("id, active") \
         .eq("id", rid) \
@@ -38,25 +277,364 @@ def validate_reviewer(rid):
     return bool(res.data)
 
 
-def get_next_article():
+def validate_reviewer(rid):
+    active = REVIEWER_CACHE.get(rid)
+    if active is None:
+        active = fetch_reviewer_active(rid)
+        REVIEWER_CACHE.set(rid, active, REVIEWER_CACHE_TTL if active else REVIEWER_MISS_TTL)
+    return active
+
+
+def fetch_article_block(exclude, limit):
     """
-    Fetch one active article from review_articles
-    that still exists in articles.
+    Up to `limit` active articles (id and headline) from review_articles that
+    still exist in articles, skipping the IDs in `exclude`.
     """
-    res = supabase.table("review_articles") \
-        .select("article_id, articles(id, headline, content)") \
-        .eq("active", True) \
+    query = supabase.table("review_articles") \
+        .select("article_id, articles(id, headline)") \
+        .eq("active", True)
+    if exclude:
+        query = query.not_.in_("article_id", sorted(exclude))
+
+    res = query.order("article_id").limit(limit).execute()
+    return [row["articles"] for row in res.data if row.get("articles")]
+
+
+def fetch_article_body(article_id):
+    res = supabase.table("articles") \
+        .select("content") \
+        .eq("id", article_id) \
         .limit(1) \
         .execute()
 
     if not res.data:
+        return ""
+    return res.data[0]["content"] or ""
+
+
+def clean_body(text):
+    """Trim lines, squeeze runs of spaces and blank lines."""
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def paginate(text, size=ARTICLE_PAGE_CHARS):
+    """
+    Cut text into pages of at most about `size` characters, breaking between
+    paragraphs where possible, then between sentences, then between words.
+    """
+    pages, current = [], ""
+    for paragraph in text.split("\n\n"):
+        pieces = re.split(r"(?<=[.!?।])\s+", paragraph) if len(paragraph) > size else [paragraph]
+        for i, piece in enumerate(pieces):
+            joiner = " " if i else "\n\n"
+            while len(piece) > size:
+                cut = piece.rfind(" ", 0, size)
+                cut = cut if cut > 0 else size
+                if current:
+                    pages.append(current)
+                    current = ""
+                pages.append(piece[:cut])
+                piece = piece[cut:].lstrip()
+            if current and len(current) + len(joiner) + len(piece) > size:
+                pages.append(current)
+                current = ""
+            current = current + joiner + piece if current else piece
+    if current:
+        pages.append(current)
+    return pages or [""]
+
+
+class ArticlePages:
+    """
+    Per-process LRU of cleaned, paginated article bodies keyed by article ID,
+    bounded by total characters. Several reviewers rate each article, so
+    only the first of them waits on Supabase for the content. Safe to share
+    between threads.
+    """
+
+    def __init__(self, fetch=fetch_article_body, max_chars=ARTICLE_CACHE_CHARS):
+        self.fetch = fetch
+        self.max_chars = max_chars
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()    # article_id -> pages
+        self.loading = {}               # article_id -> Event set once fetched
+        self.chars = 0
+        self.hits = self.misses = 0
+
+    def get(self, article_id):
+        with self.lock:
+            pages = self.entries.get(article_id)
+            if pages is not None:
+                self.entries.move_to_end(article_id)
+                self.hits += 1
+                return pages
+            # Reviewers leased the same article together wait for one fetch.
+            loading = self.loading.get(article_id)
+            if loading is None:
+                self.misses += 1
+                self.loading[article_id] = threading.Event()
+
+        if loading is not None:
+            loading.wait()
+            return self.get(article_id)
+
+        try:
+            pages = paginate(clean_body(self.fetch(article_id)))
+            with self.lock:
+                self.entries[article_id] = pages
+                self.chars += sum(map(len, pages))
+                while self.chars > self.max_chars and len(self.entries) > 1:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.chars -= sum(map(len, evicted))
+            return pages
+        finally:
+            with self.lock:
+                self.loading.pop(article_id).set()
+
+
+ARTICLE_PAGES = ArticlePages()
+
+
+def fetch_ratings(article_ids):
+    """article_id -> set of reviewer IDs who have already rated it."""
+    ratings = {article_id: set() for article_id in article_ids}
+    if not ratings:
+        return ratings
+
+    res = supabase.table("human_reviews") \
+        .select("article_id, reviewer_id") \
+        .in_("article_id", list(ratings)) \
+        .execute()
+
+    for row in res.data:
+        ratings[row["article_id"]].add(row["reviewer_id"])
+    return ratings
+
+
+def retire_articles(article_ids):
+    supabase.table("review_articles") \
+        .update({"active": False}) \
+        .in_("article_id", list(article_ids)) \
+        .execute()
+
+
+class ArticleQueue:
+    """
+    In-memory work queue over the active review_articles.
+
+    Articles are loaded a block at a time together with who has already rated
+    them. lease() then hands a reviewer the first article they haven't rated
+    whose ratings plus open leases are still below the target, without a
+    Supabase round trip; asking again while the lease is open returns the same
+    article. Leases expire after `lease_ttl` so abandoned chats give their
+    slot back. Articles that reach the target leave the queue and are
+    deactivated in review_articles on the next refill.
+
+    Assignment state lives in this process, so run a single worker.
+    """
+
+    def __init__(self, target=REVIEW_TARGET_RATINGS, lease_ttl=REVIEW_LEASE_TTL, block_size=REVIEW_PREFETCH):
+        self.target = target
+        self.lease_ttl = lease_ttl
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.refill_lock = threading.Lock()
+        self.articles = {}       # article_id -> article, in queue order
+        self.rated = {}          # article_id -> reviewer IDs with a rating
+        self.leases = {}         # article_id -> {reviewer_id: expiry}
+        self.held = {}           # reviewer_id -> article_id
+        self.finished = set()    # at target, not yet deactivated
+        self.leased = self.completed = self.refills = 0
+
+    def _open_leases(self, article_id, now):
+        leases = self.leases.setdefault(article_id, {})
+        for reviewer_id, expiry in list(leases.items()):
+            if expiry < now:
+                del leases[reviewer_id]
+                if self.held.get(reviewer_id) == article_id:
+                    del self.held[reviewer_id]
+        return leases
+
+    def _pick(self, reviewer_id):
+        now = time.monotonic()
+        article_id = self.held.get(reviewer_id)
+        if article_id in self.articles and reviewer_id in self._open_leases(article_id, now):
+            self.leases[article_id][reviewer_id] = now + self.lease_ttl
+            return self.articles[article_id]
+
+        for article_id, article in self.articles.items():
+            rated = self.rated[article_id]
+            if reviewer_id in rated:
+                continue
+            leases = self._open_leases(article_id, now)
+            if len(rated) + len(leases) >= self.target:
+                continue
+            leases[reviewer_id] = now + self.lease_ttl
+            self.held[reviewer_id] = article_id
+            self.leased += 1
+            return article
         return None
 
-    return res.data[0]["articles"]
+    def lease(self, reviewer_id):
+        """The article `reviewer_id` should rate next, or None if there is none."""
+        with self.lock:
+            article = self._pick(reviewer_id)
+        if article is not None:
+            return article
+
+        with self.refill_lock:
+            # Another reviewer may have refilled while this one waited.
+            with self.lock:
+                article = self._pick(reviewer_id)
+            if article is None:
+                self._refill()
+                with self.lock:
+                    article = self._pick(reviewer_id)
+        return article
+
+    def complete(self, reviewer_id, article_id):
+        with self.lock:
+            self.rated.setdefault(article_id, set()).add(reviewer_id)
+            self.leases.get(article_id, {}).pop(reviewer_id, None)
+            if self.held.get(reviewer_id) == article_id:
+                del self.held[reviewer_id]
+            self.completed += 1
+            if len(self.rated[article_id]) >= self.target:
+                self.articles.pop(article_id, None)
+                self.leases.pop(article_id, None)
+                self.finished.add(article_id)
+
+    def refill(self):
+        with self.refill_lock:
+            self._refill()
+
+    def _refill(self):
+        """Load the next block of active articles and retire finished ones."""
+        with self.lock:
+            known = set(self.articles) | self.finished
+            finished = set(self.finished)
+
+        articles = fetch_article_block(known, self.block_size)
+        ratings = fetch_ratings([article["id"] for article in articles])
+        for article in articles:
+            if len(ratings[article["id"]]) >= self.target:
+                finished.add(article["id"])
+        if finished:
+            retire_articles(finished)
+
+        with self.lock:
+            for article in articles:
+                if article["id"] not in finished:
+                    self.articles[article["id"]] = article
+                    self.rated[article["id"]] = ratings[article["id"]]
+            for article_id in finished:
+                self.finished.discard(article_id)
+                self.rated.pop(article_id, None)
+            self.refills += 1
+
+
+ARTICLE_QUEUE = ArticleQueue()
+
+
+def get_next_article(reviewer_id):
+    return ARTICLE_QUEUE.lease(reviewer_id)
+
+
+def insert_reviews(rows):
+    supabase.table("human_reviews").insert(rows).execute()
+
+
+class ReviewWriter:
+    """
+    Queues review rows and inserts them in batches from a background thread,
+    so /chat never waits on the insert. Failed batches are retried with
+    backoff; rows that still fail are appended to REVIEW_SPOOL_FILE and
+    re-queued the next time the writer starts.
+    """
+
+    def __init__(self, insert, batch_size=REVIEW_BATCH_SIZE, flush_interval=REVIEW_FLUSH_INTERVAL,
+                 spool_file=REVIEW_SPOOL_FILE):
+        self.insert = insert
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_file = spool_file
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+        self.written = self.batches = self.spooled = 0
+
+    def add(self, row):
+        self._ensure_started()
+        self.queue.put(row)
+
+    def _ensure_started(self):
+        # Started lazily and per process, so forking servers get their own thread.
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive() and self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self._drain_spool()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _drain_spool(self):
+        if not os.path.exists(self.spool_file):
+            return
+        with open(self.spool_file, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        os.remove(self.spool_file)
+        print(f"Retrying {len(rows)} spooled reviews")
+        for row in rows:
+            self.queue.put(row)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    def _write(self, batch):
+        for attempt in range(REVIEW_MAX_ATTEMPTS):
+            try:
+                self.insert(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                error = e
+            if attempt < REVIEW_MAX_ATTEMPTS - 1:
+                time.sleep(min(REVIEW_BACKOFF_MAX, REVIEW_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+        print(f"Review insert failed for {len(batch)} rows, spooling:", error)
+        with open(self.spool_file, "a", encoding="utf-8") as f:
+            for row in batch:
+                f.write(json.dumps(row) + "\n")
+        self.spooled += len(batch)
+
+    def flush(self):
+        """Block until every queued review has been inserted or spooled."""
+        if self.thread is not None and self.thread.is_alive() and self.pid == os.getpid():
+            self.queue.join()
+
+
+REVIEW_WRITER = ReviewWriter(insert_reviews)
+atexit.register(REVIEW_WRITER.flush)
 
 
 def save_review(data):
-    supabase.table("human_reviews").insert(data).execute()
+    REVIEW_WRITER.add(data)
 
 # ---------------- Chat Logic ----------------
 
@@ -65,64 +643,83 @@ def chat():
     user = request.json["user_id"]
     msg = request.json["message"]
 
-    if user not in sessions:
-        sessions[user] = {"stage": "ask_id"}
+    s = sessions.get(user) or {"stage": "ask_id"}
+    reply = reply_to(s, msg)
+    sessions.put(user, s)
+    return jsonify({"reply": reply})
+
+
+def page_footer(page, pages):
+    if page + 1 < len(pages):
+        return f"\n\n(Part {page + 1} of {len(pages)}. Send 'more' to keep reading.)"
+    return f"\n\n(Part {page + 1} of {len(pages)}, end of article.)" if page else ""
 
-    s = sessions[user]
+
+def reply_to(s, msg):
+    """Advance session `s` by one message and return the bot's reply."""
+    # ---------- NEXT PAGE ----------
+    if s["stage"] != "ask_id" and msg.strip().lower() == "more":
+        pages = ARTICLE_PAGES.get(s["article_id"])
+        page = s.get("page", 0) + 1
+        if page >= len(pages):
+            return "That was the whole article. Please answer the question above."
+        s["page"] = page
+        return pages[page] + page_footer(page, pages)
 
     # ---------- ASK REVIEWER ID ----------
     if s["stage"] == "ask_id":
         if validate_reviewer(msg):
             s["reviewer_id"] = msg
-            article = get_next_article()
+            article = get_next_article(msg)
 
             if not article:
-                return jsonify({"reply": "No articles left to review. Thank you!"})
+                return "No articles left to review. Thank you!"
 
-            s["article"] = article
+            # Only the ID is kept; pages come from ARTICLE_PAGES as requested.
+            s["article_id"] = article["id"]
+            s["page"] = 0
             s["responses"] = {}
             s["stage"] = "ask_political"
 
-            return jsonify({
-                "reply": (
-                    f"Headline: {article['headline']}\n\n"
-                    f"{article['content']}\n\n"
-                    "On a scale of 1–5, how politically left/right did this feel?"
-                )
-            })
+            pages = ARTICLE_PAGES.get(article["id"])
+            return (
+                f"Headline: {article['headline']}\n\n"
+                f"{pages[0]}{page_footer(0, pages)}\n\n"
+                "On a scale of 1–5, how politically left/right did this feel?"
+            )
 
-        return jsonify({"reply": "Invalid ID. Try again."})
+        return "Invalid ID. Try again."
 
     # ---------- RATINGS FLOW ----------
     elif s["stage"] == "ask_political":
         s["responses"]["political"] = int(msg)
         s["stage"] = "ask_intensity"
-        return jsonify({"reply": "How emotionally intense was the language? (1–5)"})
+        return "How emotionally intense was the language? (1–5)"
 
     elif s["stage"] == "ask_intensity":
         s["responses"]["intensity"] = int(msg)
         s["stage"] = "ask_sensational"
-        return jsonify({"reply": "How dramatic or sensational was it? (1–5)"})
+        return "How dramatic or sensational was it? (1–5)"
 
     elif s["stage"] == "ask_sensational":
         s["responses"]["sensational"] = int(msg)
         s["stage"] = "ask_threat"
-        return jsonify({"reply": "How alarming or threatening did it feel? (1–5)"})
+        return "How alarming or threatening did it feel? (1–5)"
 
     elif s["stage"] == "ask_threat":
         s["responses"]["threat"] = int(msg)
         s["stage"] = "ask_group"
-        return jsonify({"reply": "Did it feel like an 'us vs them' conflict? (1–5)"})
+        return "Did it feel like an 'us vs them' conflict? (1–5)"
 
     elif s["stage"] == "ask_group":
         s["responses"]["group_conflict"] = int(msg)
         s["stage"] = "ask_emotions"
-        return jsonify({"reply": "What emotions did you feel? (comma separated)"})
+        return "What emotions did you feel? (comma separated)"
 
     elif s["stage"] == "ask_emotions":
         s["responses"]["emotions"] = msg
         s["stage"] = "ask_highlight"
-        return jsonify({"reply": "Paste a sentence that shaped your impression (optional)"})
+        return "Paste a sentence that shaped your impression (optional)"
 
     # ---------- SAVE ----------
     elif s["stage"] == "ask_highlight":
@@ -130,17 +727,49 @@ def chat():
 
         save_review({
             "reviewer_id": s["reviewer_id"],
-            "article_id": s["article"]["id"],
+            "article_id": s["article_id"],
             **s["responses"]
         })
+        ARTICLE_QUEUE.complete(s["reviewer_id"], s["article_id"])
 
         s["stage"] = "ask_id"
-        return jsonify({
-            "reply": "Thanks! Your brain just trained a model 🧠✨\nSend your ID again to review another article."
-        })
+        return "Thanks! Your brain just trained a model 🧠✨\nSend your ID again to review another article."
+
+    return "Something went wrong."
+
+
+@app.route("/chat/article")
+def chat_article():
+    """Stream the whole article of the caller's current review, page by page."""
+    s = sessions.get(request.args.get("user_id", ""))
+    if not s or s["stage"] == "ask_id":
+        return jsonify({"error": "No article under review."}), 404
+
+    pages = ARTICLE_PAGES.get(s["article_id"])
+    return Response(
+        stream_with_context(page + "\n\n" for page in pages),
+        mimetype="text/plain; charset=utf-8",
+    )
+
 
-    return jsonify({"reply": "Something went wrong."})
+@app.route("/metrics")
+def metrics():
+    return jsonify({
+        "sessions": sessions.metrics(),
+        "reviewer_cache": {"hits": REVIEWER_CACHE.hits, "misses": REVIEWER_CACHE.misses},
+        "article_pages": {"articles": len(ARTICLE_PAGES.entries), "chars": ARTICLE_PAGES.chars,
+                          "hits": ARTICLE_PAGES.hits, "misses": ARTICLE_PAGES.misses},
+        "article_queue": {"queued": len(ARTICLE_QUEUE.articles), "leased": ARTICLE_QUEUE.leased,
+                          "completed": ARTICLE_QUEUE.completed, "refills": ARTICLE_QUEUE.refills},
+        "review_writer": {"written": REVIEW_WRITER.written, "batches": REVIEW_WRITER.batches,
+                          "spooled": REVIEW_WRITER.spooled},
+    })
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Development server. For review sprints run a threaded WSGI server that
+    # shares this module's pooled client, e.g.
+    #     gunicorn --workers 1 --threads 32 reviewer_bot_supabase:app
+    # (one worker: article leases live in process memory; SESSION_STORE=sqlite
+    # keeps chat sessions across restarts).
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", threaded=True)
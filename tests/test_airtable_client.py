@@ -0,0 +1,100 @@
+import pytest
+import requests
+
+import airtable_client
+from airtable_client import AIRTABLE_BATCH_SIZE, AirtableBatchWriter, RequestThrottle, list_records, make_session
+from benchmarks.stubs import stub_airtable
+
+
+def backlog(n):
+    return [{"id": f"rec{i}", "fields": {"Headline": f"Story {i}"}} for i in range(n)]
+
+
+def make_writer(server, method="PATCH"):
+    # A fast throttle: these tests count requests, they don't measure the rate.
+    return AirtableBatchWriter(server.url, {}, method=method, session=make_session({}), throttle=RequestThrottle(1000))
+
+
+def patch_all(writer, n):
+    with writer:
+        for i in range(n):
+            writer.add({"id": f"rec{i}", "fields": {"Processed": True}})
+
+
+def test_updates_are_batched_ten_records_per_request():
+    with stub_airtable(backlog(25)) as server:
+        writer = make_writer(server)
+        patch_all(writer, 25)
+
+    assert server.batches == [("PATCH", 10), ("PATCH", 10), ("PATCH", 5)]
+    assert all(size <= AIRTABLE_BATCH_SIZE for _, size in server.batches)
+    assert server.requests == 3
+    assert writer.written == 25 and writer.failed == []
+    assert all(r["fields"]["Processed"] for r in server.records.values())
+
+
+def test_creates_are_batched_ten_records_per_request():
+    with stub_airtable() as server:
+        writer = make_writer(server, method="POST")
+        with writer:
+            for i in range(12):
+                writer.add({"fields": {"URL": f"https://example.com/{i}"}})
+
+    assert server.batches == [("POST", 10), ("POST", 2)]
+    assert len(server.records) == 12
+
+
+def test_rate_limited_batches_are_retried():
+    # Every second request gets a 429 with Retry-After, so each of the last
+    # two batches needs exactly one retry.
+    with stub_airtable(backlog(25), rate_limit_every=2) as server:
+        writer = make_writer(server)
+        patch_all(writer, 25)
+
+    assert server.requests == 5
+    assert [size for _, size in server.batches] == [10, 10, 5]
+    assert writer.written == 25 and writer.failed == []
+
+
+def test_bare_429_waits_out_the_lockout(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(airtable_client.time, "sleep", sleeps.append)
+
+    with stub_airtable(backlog(15), rate_limit_every=2, retry_after=None) as server:
+        writer = make_writer(server)
+        patch_all(writer, 15)
+
+    assert server.requests == 3
+    assert writer.written == 15
+    assert max(sleeps) >= airtable_client.AIRTABLE_RATE_LIMIT_LOCKOUT
+
+
+def test_gives_up_after_max_attempts():
+    # Every request is rate limited.
+    with stub_airtable(backlog(3), rate_limit_every=1) as server:
+        writer = make_writer(server)
+        patch_all(writer, 3)
+
+    assert server.requests == airtable_client.AIRTABLE_MAX_ATTEMPTS
+    assert writer.written == 0 and len(writer.failed) == 3
+
+
+def list_all(server, params):
+    return list(list_records(server.url, params, session=make_session({}), throttle=RequestThrottle(1000)))
+
+
+def test_list_pages_are_retried_after_429():
+    with stub_airtable(backlog(25), page_size=10, rate_limit_every=2) as server:
+        records = list_all(server, {"fields[]": ["Headline"]})
+
+    assert [r["id"] for r in records] == [f"rec{i}" for i in range(25)]
+    # Three pages; every second request is limited, so the last two are resent once.
+    assert server.requests == 5
+
+
+def test_list_raises_when_pages_keep_failing():
+    with stub_airtable(backlog(5), rate_limit_every=1) as server:
+        with pytest.raises(requests.HTTPError):
+            list_all(server, {})
+
+    assert server.requests == airtable_client.AIRTABLE_MAX_ATTEMPTS
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+import analyze_articles as aa
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    """A temporary analysis cache and a fake LLM that records the excerpts it is asked about."""
+    monkeypatch.setitem(vars(aa), "ANALYSIS_CACHE", aa.AnalysisCache(str(tmp_path / "cache.sqlite3"), 100))
+    calls = []
+
+    def request_analysis(excerpt):
+        calls.append(excerpt)
+        return {"topic": excerpt.split()[0], "call": len(calls)}
+
+    monkeypatch.setattr(aa, "request_analysis", request_analysis)
+    return calls
+
+
+def test_analyses_are_keyed_by_content(llm):
+    assert aa.analyze_article("Budget passes after long debate.") == {"topic": "Budget", "call": 1}
+    assert aa.analyze_article("Budget  passes after long debate.") == {"topic": "Budget", "call": 1}
+    assert aa.analyze_article("Budget fails after long debate.")["call"] == 2
+    assert len(llm) == 2
+
+
+def test_singleton_cluster_gets_fresh_analysis_when_body_changes(llm):
+    key = "https://news.example/a"
+    aa.analyze_article("Flood warning issued.", key, key)
+    assert aa.analyze_article("Flood warning lifted.", key, key)["call"] == 2
+
+
+def test_cluster_members_reuse_the_representative_analysis(llm):
+    rep, member = "https://news.example/a", "https://other.example/b"
+    first = aa.analyze_article("Strike halts trains across the state.", rep, rep)
+    assert aa.analyze_article("Strike halts all trains across the state today.", rep, member) == first
+    assert len(llm) == 1
+
+    # The representative is re-scraped with a new body: the cluster's shared
+    # analysis follows it rather than staying on the old one.
+    updated = aa.analyze_article("Strike ends, trains resume.", rep, rep)
+    assert updated["call"] == 2
+    assert aa.analyze_article("Strike halts all trains across the state today.", rep, member) == updated
+
+
+def test_members_without_a_representative_analysis_share_the_first(llm):
+    cluster = "https://news.example/pruned"
+    first = aa.analyze_article("Court upholds the ruling.", cluster, "https://x.example/1")
+    assert aa.analyze_article("Court upholds ruling on appeal.", cluster, "https://y.example/2") == first
+    assert len(llm) == 1
+
+
+def test_members_wait_for_an_in_flight_representative(llm, monkeypatch):
+    fast = aa.request_analysis
+    started = threading.Event()
+
+    def slow_request(excerpt):
+        started.set()
+        time.sleep(0.2)
+        return fast(excerpt)
+
+    monkeypatch.setattr(aa, "request_analysis", slow_request)
+    rep, member = "https://news.example/a", "https://other.example/b"
+    results = {}
+    thread = threading.Thread(target=lambda: results.setdefault("rep", aa.analyze_article("Dam breach floods valley.", rep, rep)))
+    thread.start()
+    started.wait()
+    results["member"] = aa.analyze_article("Dam breach floods the valley below.", rep, member)
+    thread.join()
+
+    assert results["member"] == results["rep"]
+    assert len(llm) == 1
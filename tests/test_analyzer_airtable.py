@@ -0,0 +1,56 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import analyze_articles as aa
+from article_store import ArticleStore
+from benchmarks.stubs import stub_airtable
+
+
+def unprocessed(n):
+    return [
+        {"id": f"rec{i:03d}", "fields": {"URL": f"https://news.example/{i}", "Content": f"Body {i}", "Processed": False}}
+        for i in range(n)
+    ]
+
+
+def test_unprocessed_records_are_downloaded_once(monkeypatch):
+    with stub_airtable(unprocessed(25), page_size=10) as server:
+        monkeypatch.setattr(aa, "AIRTABLE_URL", server.url)
+        records = list(aa.iter_unprocessed_articles())
+
+    assert sorted(r["id"] for r in records) == [f"rec{i:03d}" for i in range(25)]
+    # Three full pages, then three ID-only pages that find nothing new.
+    assert server.requests == 6
+
+
+def test_records_skipped_by_a_shifting_cursor_are_fetched_by_id(monkeypatch):
+    with stub_airtable(unprocessed(25), page_size=10) as server:
+        monkeypatch.setattr(aa, "AIRTABLE_URL", server.url)
+        records = []
+        for record in aa.iter_unprocessed_articles():
+            # Marking records processed mid-scan shifts later pages forward.
+            server.records[record["id"]]["fields"]["Processed"] = True
+            records.append(record)
+
+    ids = [r["id"] for r in records]
+    assert sorted(ids) == [f"rec{i:03d}" for i in range(25)]
+    assert len(ids) == len(set(ids))
+    assert all(r["fields"]["Content"] for r in records)
+
+
+def test_short_articles_are_marked_processed(tmp_path, monkeypatch):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setitem(vars(aa), "ARTICLE_STORE", store)
+    monkeypatch.setitem(vars(aa), "LEXICAL", SimpleNamespace(extract=lambda text, vader: SimpleNamespace(word_count=3)))
+    monkeypatch.setattr(aa, "update_record", lambda record_id, fields: updates.append((record_id, fields)))
+    updates = []
+    record = {"URL": "https://news.example/short", "Content": "Too short to analyze."}
+    article = {"id": "rec001", "key": store.add(record), "fields": record}
+
+    future = Future()
+    future.set_result(aa.score_article(article))
+    aa.write_back(article, future)
+
+    assert updates == [("rec001", {"Processed": True})]
+    assert store.analysis_fields(article["key"]) == {"Processed": True}
+    assert list(store.iter_unprocessed()) == []
@@ -0,0 +1,111 @@
+import json
+import time
+
+import analyze_articles as aa
+from article_store import GROUP_EXTREMES_SQL, ArticleStore
+from benchmarks.stubs import stub_airtable
+
+
+def airtable_record(n, processed=True, **fields):
+    record = {
+        "id": f"rec{n}",
+        "fields": {
+            "Headline": f"Story {n}",
+            "Author": "Staff",
+            "Publisher Name": "NDTV" if n % 2 else "The Hindu",
+            "Publication Date & Time": f"2026-10-0{1 + n % 3}T05:00:00.000Z",
+            "URL": f"https://news.example/{n}?utm_source=feed",
+            "Content": "Body text " * 50,
+            "Processed": processed,
+        },
+    }
+    if processed:
+        record["fields"].update({
+            "Composite Ideology Score": 0.5 * n,
+            "Political Leaning": "Left" if n % 2 else "Right",
+            "Sentiment": "Negative",
+            "Topic": "Politics",
+            "AI Framing Direction": -0.2,
+            "AI Language Intensity": 0.6,
+        })
+    record["fields"].update(fields)
+    return record
+
+
+def test_import_archive_backfills_processed_history(tmp_path, monkeypatch):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setitem(vars(aa), "ARTICLE_STORE", store)
+    records = [airtable_record(n) for n in range(6)] + [airtable_record(6, processed=False)]
+
+    with stub_airtable(records) as server:
+        monkeypatch.setattr(aa, "AIRTABLE_URL", server.url)
+        path = str(tmp_path / "archive.jsonl")
+        assert aa.export_archive(path, aa.ARCHIVE_FIELDS) == 6
+
+    assert aa.import_archive(path) == (6, 6)
+    assert len(store) == 6
+    assert store.query("SELECT COUNT(*) FROM articles WHERE processed = 1 AND day IS NOT NULL")[0][0] == 6
+    assert store.key_for("rec3") == "https://news.example/3"
+
+    by_day = store.aggregate("composite_score", by=("day",), histogram=False)
+    assert [(r["day"], r["count"]) for r in by_day] == [("2026-10-01", 2), ("2026-10-02", 2), ("2026-10-03", 2)]
+    leaning = store.aggregate("political_leaning", by=("publisher",))
+    assert {r["publisher"]: r["counts"] for r in leaning} == {"NDTV": {"Left": 3}, "The Hindu": {"Right": 3}}
+
+
+def test_import_archive_keeps_local_analyses(tmp_path, monkeypatch):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setitem(vars(aa), "ARTICLE_STORE", store)
+    key = store.add(airtable_record(1)["fields"])
+    store.save_analysis(key, {"Composite Ideology Score": 2.0, "Topic": "Economy"})
+
+    path = tmp_path / "archive.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in [airtable_record(1), airtable_record(2)]))
+
+    assert aa.import_archive(str(path)) == (2, 1)
+    assert store.analysis_fields(key)["Composite Ideology Score"] == 2.0
+    assert store.aggregate("composite_score", histogram=False, by=())[0]["count"] == 2
+
+
+def test_group_extremes_are_found_through_the_day_publisher_index(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    plan = store.query("EXPLAIN QUERY PLAN " + GROUP_EXTREMES_SQL.format(metric="framing_direction"),
+                       "2026-10-01", "NDTV", "politics")
+    assert "USING INDEX articles_day_publisher" in plan[0][-1]
+
+
+def test_rescoring_an_extreme_stays_fast_in_a_large_archive(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    publishers = [f"Publisher {p}" for p in range(12)]
+    days = [f"2026-{m:02d}-{d:02d}" for m in range(1, 11) for d in range(1, 26)]
+    rows = [
+        (f"https://news.example/{n}", f"https://news.example/{n}", publishers[n % 12], days[n % 250], time.time(),
+         "Politics", (n % 200) / 100 - 1)
+        for n in range(30000)
+    ]
+    with store.db:
+        store.db.executemany(
+            "INSERT INTO articles (key, url, publisher, day, scraped_at, processed, topic, framing_direction) "
+            "VALUES (?, ?, ?, ?, ?, 1, ?, ?)", rows
+        )
+    store.rebuild_aggregates()
+    group = {"day": days[0], "publisher": publishers[0]}
+
+    # Each save moves the group's current maximum down, forcing a recompute.
+    started = time.perf_counter()
+    for n in range(0, 3000, 12):
+        (key, high), = store.query(
+            "SELECT key, framing_direction FROM articles WHERE day = ? AND publisher = ? "
+            "ORDER BY framing_direction DESC LIMIT 1", group["day"], group["publisher"]
+        )
+        store.save_analysis(key, {"AI Framing Direction": high - 2.0, "Topic": "Politics"})
+    elapsed = time.perf_counter() - started
+
+    expected = store.query(
+        "SELECT MIN(framing_direction), MAX(framing_direction) FROM articles WHERE day = ? AND publisher = ?",
+        group["day"], group["publisher"]
+    )[0]
+    result = store.aggregate("framing_direction", by=(), histogram=False, **group)[0]
+    assert (result["min"], result["max"]) == expected
+    # 250 saves; a full table scan per save takes several seconds here.
+    assert elapsed < 1.0
@@ -0,0 +1,24 @@
+import os
+import statistics
+
+from benchmarks.import_time import IMPORT_BUDGET, import_once
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_analyzer_import_stays_within_budget(tmp_path, monkeypatch):
+    # import_once puts the working directory on the child's path; the child
+    # itself runs in an empty directory so stray files show up.
+    monkeypatch.chdir(REPO_ROOT)
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+
+    runs = []
+    for _ in range(5):
+        run, stderr = import_once("analyze_articles", str(cwd))
+        assert run is not None, stderr
+        runs.append(run)
+
+    assert statistics.median(run["seconds"] for run in runs) <= IMPORT_BUDGET
+    assert [run["loaded"] for run in runs] == [[]] * 5
+    assert os.listdir(cwd) == []
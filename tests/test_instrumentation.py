@@ -0,0 +1,24 @@
+from instrumentation import NO_SPAN, Metrics
+
+
+def test_disabled_metrics_record_only_always_spans_and_counts():
+    metrics = Metrics(enabled=False)
+    assert metrics.span("analyzer.llm") is NO_SPAN
+    metrics.count("llm.retry")
+
+    with metrics.span("scraper.download", always=True):
+        pass
+    metrics.count("scraper.extractor_win.rules.NDTV", always=True)
+
+    summary = metrics.summary()
+    assert list(summary["spans"]) == ["scraper.download"]
+    assert summary["spans"]["scraper.download"]["calls"] == 1
+    assert summary["counters"] == {"scraper.extractor_win.rules.NDTV": 1}
+
+
+def test_export_is_a_no_op_while_disabled(tmp_path):
+    metrics = Metrics(enabled=False)
+    with metrics.span("scraper.feed", always=True):
+        pass
+    metrics.export(textfile=str(tmp_path / "metrics.prom"), summary_file=str(tmp_path / "summary.json"))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,52 @@
+import math
+import random
+
+import analyze_articles as aa
+
+LM_NEGATIVE = {"loss", "crisis", "decline", "risk"}
+LM_UNCERTAINTY = {"risk", "may", "uncertain"}
+EMOLEX = {
+    "crisis": {"fear", "sadness"},
+    "attack": {"anger", "fear"},
+    "hope": {"joy", "trust", "anticipation"},
+    "corrupt": {"disgust", "anger"},
+    "सरकार": {"trust"},
+    "हिंसा": {"anger", "fear"},
+}
+BWS_LEXICON = {"attack": 0.8, "crisis": 0.7, "hope": 0.4, "हिंसा": 0.9, "zeal": 0.3}
+
+
+def dict_scores(text):
+    words = aa.WORD_PATTERN.findall(text.lower())
+    counts = dict.fromkeys(aa.TRACKED_EMOTIONS, 0)
+    for w in words:
+        for emo in EMOLEX.get(w, ()):
+            if emo in counts:
+                counts[emo] += 1
+    total = sum(counts.values()) or 1
+    return {
+        "word_count": len(words),
+        "lm_negative": sum(w in LM_NEGATIVE for w in words),
+        "lm_uncertainty": sum(w in LM_UNCERTAINTY for w in words),
+        "emotions": {k: v / total for k, v in counts.items()},
+        "bws_intensity": sum(BWS_LEXICON.get(w, 0) for w in words) / (len(words) or 1),
+    }
+
+
+def test_compiled_scores_match_dict_lookups(tmp_path):
+    compiled = aa.CompiledLexicon.from_lexicons(LM_NEGATIVE, LM_UNCERTAINTY, EMOLEX, BWS_LEXICON)
+    compiled.save(str(tmp_path))
+    lexical = aa.LexicalFeatures(aa.CompiledLexicon.load(str(tmp_path)))
+
+    # Lexicon words, out-of-vocabulary words sorting before and after the
+    # whole vocabulary, mixed case and Devanagari.
+    vocab = [*LM_NEGATIVE, *LM_UNCERTAINTY, *EMOLEX, *BWS_LEXICON, "aaa", "zzzz", "the", "Crisis", "नया"]
+    rng = random.Random(0)
+    texts = ["", "!!!"] + [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 60))) for _ in range(300)]
+
+    for text, result in zip(texts, lexical.extract_batch(texts), strict=True):
+        expected = dict_scores(text)
+        assert result.word_count == expected["word_count"]
+        assert (result.lm_negative, result.lm_uncertainty) == (expected["lm_negative"], expected["lm_uncertainty"])
+        assert all(math.isclose(result.emotions[k], v) for k, v in expected["emotions"].items())
+        assert math.isclose(result.bws_intensity, expected["bws_intensity"], abs_tol=1e-12)
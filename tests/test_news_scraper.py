@@ -0,0 +1,86 @@
+import json
+
+import pytest
+import requests
+
+import news_scraper as scraper
+from airtable_client import AirtableBatchWriter, RequestThrottle, make_session
+from benchmarks.stubs import stub_airtable, stub_pages
+
+HINDI = "सरकार ने आज संसद में नया बजट पेश किया और विपक्ष ने इसकी कड़ी आलोचना की।"
+
+
+def hindi_page(head=""):
+    paragraphs = "".join(f"<p>{HINDI} {i}</p>" for i in range(12))
+    return f"<html><head>{head}<title>बजट</title></head><body><article>{paragraphs}</article></body></html>"
+
+
+@pytest.mark.parametrize("path, content_type, head", [
+    ("/meta.html", "text/html", '<meta charset="utf-8">'),
+    ("/http-equiv.html", "text/html", '<meta http-equiv="Content-Type" content="text/html; charset=UTF-8">'),
+    ("/bare.html", "text/html", ""),
+    ("/header.html", "text/html; charset=utf-8", ""),
+])
+def test_utf8_pages_without_a_charset_header_are_not_garbled(path, content_type, head):
+    with stub_pages({path: (content_type, hindi_page(head).encode("utf-8"))}) as server:
+        text, _ = scraper.extract_article_text(server.url + path, "Hindi Publisher")
+
+    assert HINDI in text
+    assert "à¤" not in text
+
+
+def url_records(n):
+    return [{"id": f"rec{i}", "fields": {"URL": f"https://news.example/{i}?utm_source=feed"}} for i in range(n)]
+
+
+def test_url_sync_retries_rate_limited_pages(tmp_path, monkeypatch):
+    index = scraper.UrlIndex(str(tmp_path / "urls.sqlite3"))
+    with stub_airtable(url_records(5), page_size=2, rate_limit_every=2) as server:
+        monkeypatch.setattr(scraper, "AIRTABLE_URL", server.url)
+        assert index.sync() == 5
+
+    assert len(index) == 5
+    assert index.contains("https://news.example/3")
+
+
+def test_failed_url_sync_raises_and_keeps_the_watermark(tmp_path, monkeypatch):
+    index = scraper.UrlIndex(str(tmp_path / "urls.sqlite3"))
+    with stub_airtable(url_records(5), rate_limit_every=1) as server:
+        monkeypatch.setattr(scraper, "AIRTABLE_URL", server.url)
+        with pytest.raises(requests.HTTPError):
+            index.sync()
+
+    assert index.db.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone() is None
+
+
+def spool(tmp_path, monkeypatch, server, records):
+    path = tmp_path / "airtable_spool.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    monkeypatch.setattr(scraper, "SPOOL_FILE", str(path))
+    monkeypatch.setattr(scraper, "UPLOADER", AirtableBatchWriter(
+        server.url, {}, method="POST", session=make_session({}), throttle=RequestThrottle(1000)
+    ))
+    return path
+
+
+def test_drained_spool_is_removed_once_everything_is_sent(tmp_path, monkeypatch):
+    records = [{"fields": {"URL": f"https://news.example/{i}"}} for i in range(12)]
+    with stub_airtable() as server:
+        path = spool(tmp_path, monkeypatch, server, records)
+        scraper.drain_spool()
+
+    assert not path.exists()
+    assert len(server.records) == 12
+
+
+def test_records_that_fail_again_stay_in_the_spool(tmp_path, monkeypatch):
+    records = [{"fields": {"URL": f"https://news.example/{i}"}} for i in range(12)]
+    with stub_airtable(rate_limit_every=1) as server:
+        path = spool(tmp_path, monkeypatch, server, records)
+        scraper.drain_spool()
+
+    # Still on disk without waiting for flush_uploads() at exit, and not
+    # queued to be spooled a second time.
+    assert [json.loads(line) for line in path.read_text().splitlines()] == records
+    assert scraper.UPLOADER.failed == []
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,92 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test")
+
+import reviewer_bot_supabase as bot
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return bot.MemorySessionStore(**kwargs)
+        return bot.SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), **kwargs)
+    return make
+
+
+def test_store_keeps_exactly_max_entries(make_store):
+    store = make_store(max_entries=50)
+    for n in range(120):
+        store.put(f"chat-{n}", {"n": n})
+        assert store.metrics()["sessions"] == min(n + 1, 50)
+
+    assert store.metrics()["evicted"] == 70
+    assert [n for n in range(120) if store.get(f"chat-{n}") is not None] == list(range(70, 120))
+
+
+def test_store_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=3)
+    for user in ("a", "b", "c"):
+        store.put(user, {"user": user})
+        time.sleep(0.01)
+    # "a" is the oldest but gets a new message, so "b" goes first.
+    store.put("a", {"user": "a", "turn": 2})
+    store.put("d", {"user": "d"})
+
+    assert store.get("b") is None
+    assert store.get("a") == {"user": "a", "turn": 2}
+    assert store.get("c") is not None and store.get("d") is not None
+
+
+def test_sessions_expire_after_ttl(make_store):
+    store = make_store(ttl=0.2, max_entries=10)
+    for n in range(5):
+        store.put(f"chat-{n}", {"n": n})
+    assert store.get("chat-0") == {"n": 0}
+
+    time.sleep(0.3)
+    assert all(store.get(f"chat-{n}") is None for n in range(5))
+    assert store.metrics()["expired"] == 5
+    assert store.metrics()["sessions"] == 0
+
+
+def advance(path, worker, users):
+    """One worker process's turn: append its number to every user's session."""
+    store = bot.SQLiteSessionStore(path)
+    for n in range(users):
+        s = store.get(f"chat-{n}") or {"turns": []}
+        s["turns"].append(worker)
+        store.put(f"chat-{n}", s)
+
+
+def fill(path, worker, users, max_entries):
+    store = bot.SQLiteSessionStore(path, max_entries=max_entries)
+    for n in range(users):
+        store.put(f"w{worker}-{n}", {"n": n})
+    return store.metrics()["sessions"]
+
+
+def test_processes_share_sessions(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    # Each of a reviewer's messages may land on a different worker process.
+    for worker in range(3):
+        with ProcessPoolExecutor(1) as pool:
+            pool.submit(advance, path, worker, 20).result()
+
+    store = bot.SQLiteSessionStore(path)
+    assert all(store.get(f"chat-{n}")["turns"] == [0, 1, 2] for n in range(20))
+
+
+def test_bound_holds_across_processes(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    bot.SQLiteSessionStore(path)
+    with ProcessPoolExecutor(4) as pool:
+        kept = list(pool.map(fill, [path] * 4, range(4), [200] * 4, [100] * 4))
+
+    assert kept == [100] * 4
+    assert bot.SQLiteSessionStore(path).metrics()["sessions"] == 100